@@ -0,0 +1,110 @@
+"""Compare bulk_files with per-file os calls on a large directory tree.
+
+Creates, renames by pattern and recursively deletes a tree of --files files
+spread over --dirs directories, once the way file_manager_demo does it
+(os.path.exists, os.listdir and os.path.join for every file) and once with
+bulk_files.
+
+Usage: python benchmarks/bench_file_ops.py [--files N] [--dirs N] [--workers N]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bulk_files
+
+def tree_paths(files, dirs):
+    return [os.path.join(f"dir{i % dirs:04d}", f"file{i:07d}.txt")
+            for i in range(files)]
+
+def per_file_create(root, paths):
+    for path in paths:
+        folder = os.path.join(root, os.path.dirname(path))
+        if not os.path.exists(folder):
+            os.mkdir(folder)
+        with open(os.path.join(root, path), 'w') as f:
+            f.write(f"This is {os.path.basename(path)}")
+
+def per_file_rename(root):
+    count = 0
+    for folder in os.listdir(root):
+        folder_path = os.path.join(root, folder)
+        for name in os.listdir(folder_path):
+            old_path = os.path.join(folder_path, name)
+            if name.endswith('.txt') and os.path.exists(old_path):
+                os.rename(old_path, os.path.join(folder_path, name[:-4] + '.dat'))
+                count += 1
+    return count
+
+def per_file_delete(root):
+    for folder in os.listdir(root):
+        folder_path = os.path.join(root, folder)
+        if os.path.isdir(folder_path):
+            for name in os.listdir(folder_path):
+                os.remove(os.path.join(folder_path, name))
+            os.rmdir(folder_path)
+        else:
+            os.remove(folder_path)
+    os.rmdir(root)
+
+def bulk_create(root, paths, workers):
+    bulk_files.create_files(root, paths,
+                            lambda path: f"This is {os.path.basename(path)}",
+                            workers=workers)
+
+def bulk_rename(root, workers):
+    return bulk_files.rename_matching(root, r'\.txt$', '.dat', recursive=True,
+                                      workers=workers)
+
+def bulk_delete(root, workers):
+    bulk_files.delete_tree(root, workers=workers)
+
+def timed(label, func, *args):
+    # Flush dirty pages left by the previous phase so they are not written
+    # back in the middle of this one.
+    if hasattr(os, 'sync'):
+        os.sync()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<8} {elapsed:8.2f}s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--files', type=int, default=100_000)
+    parser.add_argument('--dirs', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=bulk_files.DEFAULT_WORKERS)
+    parser.add_argument('--dir', help="where to build the tree (default: temp dir)")
+    args = parser.parse_args()
+
+    paths = tree_paths(args.files, args.dirs)
+    base = tempfile.mkdtemp(prefix='bench_file_ops_', dir=args.dir)
+
+    try:
+        print(f"{args.files:,} files in {args.dirs} directories\n")
+
+        print("Per-file os calls:")
+        root = os.path.join(base, 'per_file')
+        os.mkdir(root)
+        per_file_total = (timed("create", per_file_create, root, paths)
+                          + timed("rename", per_file_rename, root)
+                          + timed("delete", per_file_delete, root))
+
+        print(f"\nbulk_files ({args.workers} workers):")
+        root = os.path.join(base, 'bulk')
+        bulk_total = (timed("create", bulk_create, root, paths, args.workers)
+                      + timed("rename", bulk_rename, root, args.workers)
+                      + timed("delete", bulk_delete, root, args.workers))
+
+        print(f"\nTotal: per-file {per_file_total:.2f}s, bulk {bulk_total:.2f}s "
+              f"({per_file_total / bulk_total:.1f}x)")
+    finally:
+        bulk_files.delete_tree(base)
+
+if __name__ == "__main__":
+    main()
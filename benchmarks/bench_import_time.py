@@ -0,0 +1,61 @@
+"""Compare start-up cost of the lazy CLI with importing every tool eagerly.
+
+Runs each case in a fresh interpreter with -X importtime and reports the
+total import time it logs, plus the wall-clock time of the whole process.
+
+Usage: python benchmarks/bench_import_time.py [--repeat N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cli import COMMANDS
+
+def import_time_us(code):
+    """Return (self-reported import microseconds, wall seconds) for code."""
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True,
+                            stdin=subprocess.DEVNULL)
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr)
+    
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us = line.split(':', 1)[1].split('|')[0]
+        total += int(self_us)
+    return total, wall
+
+def best_of(code, repeat):
+    runs = [import_time_us(code) for _ in range(repeat)]
+    return min(us for us, wall in runs), min(wall for us, wall in runs)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    modules = sorted({module_name for module_name, _, _ in COMMANDS.values()})
+    cases = [
+        ("bare interpreter", "pass"),
+        ("cli (lazy dispatch)", "import cli"),
+        ("cli + one tool", "import cli, login_attempts"),
+        ("all tools eagerly", "import " + ", ".join(modules)),
+    ]
+    
+    print(f"{'Case':<22} {'imports (ms)':>14} {'process (ms)':>14}")
+    print("-" * 52)
+    for name, code in cases:
+        us, wall = best_of(code, args.repeat)
+        print(f"{name:<22} {us / 1000:>14.1f} {wall * 1000:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Measure LoginMonitor throughput on a synthetic authentication stream.
+
+Usage: python benchmarks/bench_login.py [--events N] [--users N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from login_attempts import LoginMonitor
+
+def make_events(count, users, failure_rate, rng):
+    names = [f"user{i}" for i in range(users)]
+    timestamp = 0.0
+    events = []
+    for _ in range(count):
+        timestamp += rng.expovariate(1000)
+        status = "failed" if rng.random() < failure_rate else "success"
+        events.append((rng.choice(names), status, timestamp))
+    return events
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=2_000_000)
+    parser.add_argument('--users', type=int, default=500_000)
+    parser.add_argument('--max-users', type=int, default=100_000)
+    parser.add_argument('--failure-rate', type=float, default=0.3)
+    args = parser.parse_args()
+    
+    events = make_events(args.events, args.users, args.failure_rate,
+                         random.Random(42))
+    monitor = LoginMonitor(threshold=3, window_seconds=60,
+                           max_users=args.max_users)
+    
+    start = time.perf_counter()
+    alerts = sum(1 for _ in monitor.stream(events))
+    elapsed = time.perf_counter() - start
+    
+    print(f"Events processed: {args.events:,}")
+    print(f"Alerts raised: {alerts:,}")
+    print(f"Users tracked at end: {len(monitor.failures):,}")
+    print(f"Elapsed: {elapsed:.2f}s ({args.events / elapsed:,.0f} events/sec, "
+          f"{args.events / elapsed * 60:,.0f} events/min)")
+
+if __name__ == "__main__":
+    main()
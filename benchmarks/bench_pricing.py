@@ -0,0 +1,68 @@
+"""Compare per-row calculate_discount pricing with the PricingEngine batch path.
+
+Usage: python benchmarks/bench_pricing.py [--rows N] [--block-size N]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from product_pricing_manager import PricingEngine, calculate_discount
+
+CATEGORIES = ['Electronics', 'Clothing', 'Books', 'Home', 'Garden']
+TIERS = ['Premium', 'Standard', 'Budget', 'Unknown']
+
+def make_block(size, rng):
+    base_prices = array('d', (rng.uniform(1, 2000) for _ in range(size)))
+    categories = [rng.choice(CATEGORIES) for _ in range(size)]
+    tiers = [rng.choice(TIERS) for _ in range(size)]
+    return base_prices, categories, tiers
+
+def per_row(base_prices, categories, tiers):
+    total = 0
+    for base_price, category, tier in zip(base_prices, categories, tiers):
+        discount_pct = calculate_discount(category, tier)
+        discount_amt = base_price * (discount_pct / 100)
+        final_price = base_price - discount_amt
+        total += discount_pct
+    return total
+
+def batch(engine, base_prices, categories, tiers):
+    category_codes, tier_codes = engine.encode(categories, tiers)
+    discount_pct, discount_amt, final_price = engine.price_block(
+        base_prices, category_codes, tier_codes)
+    return float(sum(discount_pct))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--block-size', type=int, default=100_000)
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    block = make_block(args.block_size, rng)
+    blocks = args.rows // args.block_size
+    engine = PricingEngine()
+    
+    start = time.perf_counter()
+    row_total = sum(per_row(*block) for _ in range(blocks))
+    row_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch_total = sum(batch(engine, *block) for _ in range(blocks))
+    batch_time = time.perf_counter() - start
+    
+    assert math.isclose(row_total, batch_total), (row_total, batch_total)
+    rows = blocks * args.block_size
+    print(f"Rows priced: {rows:,}")
+    print(f"Per-row path: {row_time:.2f}s ({rows / row_time:,.0f} rows/sec)")
+    print(f"Batch engine: {batch_time:.2f}s ({rows / batch_time:,.0f} rows/sec)")
+    print(f"Speedup: {row_time / batch_time:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Bulk file operations for staging and cleaning large working directories.
+
+Directories are read once with os.scandir, whose entries already know
+whether they are files or directories, instead of calling os.listdir,
+os.path.join and os.path.exists for every file. The per-file system calls
+that remain (create, rename, unlink) are metadata operations that spend
+their time waiting on the filesystem, so they are handed to a thread pool
+in batches; pass workers=1 to run them in the calling thread.
+"""
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_WORKERS = 8
+BATCH_SIZE = 512
+
+def run_batched(func, items, workers=DEFAULT_WORKERS):
+    """Call func(item) for every item, on a thread pool when workers > 1.
+
+    Items are submitted in batches so the pool overhead is paid per batch
+    rather than per file. The first exception raised by func is re-raised.
+    """
+    items = list(items)
+    if workers <= 1 or len(items) <= BATCH_SIZE:
+        for item in items:
+            func(item)
+        return len(items)
+
+    def run_batch(batch):
+        for item in batch:
+            func(item)
+
+    batches = [items[i:i + BATCH_SIZE] for i in range(0, len(items), BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for _ in pool.map(run_batch, batches):
+            pass
+    return len(items)
+
+def iter_entries(directory, recursive=False):
+    """Yield os.DirEntry objects under directory, parents before children.
+
+    Symlinks to directories are yielded but not followed.
+    """
+    pending = [directory]
+    while pending:
+        with os.scandir(pending.pop()) as it:
+            for entry in it:
+                yield entry
+                if recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+
+def create_files(root, paths, content=b'', workers=DEFAULT_WORKERS,
+                 overwrite=True):
+    """Create every file in paths (relative to root) with the given content.
+
+    content may be bytes, str, or a function of the relative path returning
+    either. Parent directories are created once each, up front. With
+    overwrite=False an existing file raises FileExistsError. Returns the
+    number of files created.
+    """
+    paths = list(paths)
+    parents = {os.path.dirname(path) for path in paths}
+    for parent in sorted(parents):
+        os.makedirs(os.path.join(root, parent), exist_ok=True)
+
+    flags = os.O_WRONLY | os.O_CREAT | (os.O_TRUNC if overwrite else os.O_EXCL)
+    flags |= getattr(os, 'O_BINARY', 0)
+
+    def create(path):
+        data = content(path) if callable(content) else content
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        fd = os.open(os.path.join(root, path), flags, 0o666)
+        try:
+            if data:
+                os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    return run_batched(create, paths, workers)
+
+def plan_renames(directory, pattern, replacement, recursive=False):
+    """Return [(old_path, new_path), ...] for files whose names match pattern.
+
+    pattern is a regular expression searched for in each file name and
+    replaced as with re.sub. Raises ValueError if a new name is empty or
+    contains a path separator, if two files would end up with the same name,
+    or if a new name collides with an existing entry.
+    """
+    regex = re.compile(pattern)
+    renames = []
+    names_by_dir = {}
+
+    for entry in iter_entries(directory, recursive):
+        parent = os.path.dirname(entry.path)
+        names_by_dir.setdefault(parent, set()).add(entry.name)
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        new_name = regex.sub(replacement, entry.name)
+        if new_name == entry.name:
+            continue
+        if (new_name in ('', '.', '..') or os.sep in new_name
+                or (os.altsep and os.altsep in new_name)):
+            raise ValueError(f"Invalid new name for {entry.path}: {new_name!r}")
+        renames.append((entry.path, os.path.join(parent, new_name)))
+
+    moving = {old for old, new in renames}
+    targets = set()
+    for old, new in renames:
+        parent, new_name = os.path.split(new)
+        if new in targets or (new_name in names_by_dir[parent] and new not in moving):
+            raise ValueError(f"Renaming {old} would overwrite {new}")
+        targets.add(new)
+
+    # A file may take the name another file is giving up; rename the ones
+    # whose targets are already free first.
+    if targets & moving:
+        renames = order_renames(renames)
+    return renames
+
+def order_renames(renames):
+    """Order renames so no file is renamed onto a name still in use."""
+    pending = dict(renames)
+    ordered = []
+    while pending:
+        ready = [old for old, new in pending.items() if new not in pending]
+        if not ready:
+            raise ValueError("Renames form a cycle; rename through a temporary "
+                             "name first")
+        for old in ready:
+            ordered.append((old, pending.pop(old)))
+    return ordered
+
+def rename_matching(directory, pattern, replacement, recursive=False,
+                    workers=DEFAULT_WORKERS):
+    """Rename every file under directory whose name matches pattern.
+
+    Nothing is renamed if any rename would overwrite another file. Returns
+    the number of files renamed.
+    """
+    renames = plan_renames(directory, pattern, replacement, recursive)
+    targets = {new for old, new in renames}
+    if any(old in targets for old, new in renames):
+        # Chained renames must happen in the planned order.
+        workers = 1
+    return run_batched(lambda pair: os.rename(*pair), renames, workers)
+
+def delete_tree(path, workers=DEFAULT_WORKERS):
+    """Recursively delete path and everything below it.
+
+    Files and symlinks are unlinked on the thread pool, then directories are
+    removed deepest first. Symlinks to directories are removed, not
+    followed, and that includes path itself: if it is a symlink only the
+    link is unlinked. Returns (files_deleted, directories_deleted).
+    """
+    if os.path.islink(path):
+        os.unlink(path)
+        return 1, 0
+
+    files = []
+    directories = [path]
+    for entry in iter_entries(path, recursive=True):
+        if entry.is_dir(follow_symlinks=False):
+            directories.append(entry.path)
+        else:
+            files.append(entry.path)
+
+    run_batched(os.unlink, files, workers)
+
+    # iter_entries yields parents before children, so reversed order
+    # removes every directory after its subdirectories.
+    for directory in reversed(directories):
+        os.rmdir(directory)
+    return len(files), len(directories)
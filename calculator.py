@@ -1,22 +1,237 @@
 '''Business Profit Calculator
 Calculates profit and margin percentage
-from revenue and cost data'''
+from revenue and cost data
 
-# Get revenue from user
-revenue = float(input("Enter total revenue: $"))
+Run without arguments for the interactive calculator, or pass a CSV file
+with store, date, revenue and cost columns for per-store and per-day
+summaries. Amounts are handled as integer cents so totals over millions of
+rows are exact.'''
+import argparse
+import csv
+import time
+from itertools import islice
+from decimal import Decimal, ROUND_HALF_UP
 
-# Get costs from user 
-costs = float(input("Enter total costs: $"))
+from expense_ledger import format_cents, parse_cents
 
-# Calculate profit
-profit = revenue - costs
+CHUNK_ROWS = 50_000
+MARGIN_PLACES = Decimal('0.01')
 
-# Calculate profit margin percentage
-margin = (profit / revenue) * 100
+def to_cents(text):
+    """Convert an amount to integer cents without going through float.
 
-# Display results
-print("\n--- Financial Summary ---")
-print(f"Revenue: ${revenue:,.2f}")
-print(f"Costs: ${costs:,.2f}")
-print(f"Profit: ${profit:,.2f}")
-print(f"Profit Margin: {margin:.1f}%")
\ No newline at end of file
+    Plain amounts such as '1234.5' or '-12.34' are converted with integer
+    arithmetic; anything else ('$1,234.567') falls back to Decimal parsing
+    with half-up rounding.
+    """
+    whole, dot, frac = text.strip().partition('.')
+    digits = whole[1:] if whole[:1] == '-' else whole
+    if digits.isdigit() and len(frac) <= 2 and (not frac or frac.isdigit()):
+        cents = int(digits) * 100 + int(frac.ljust(2, '0'))
+        return -cents if whole[:1] == '-' else cents
+    return parse_cents(text)
+
+def margin_percent(profit_cents, revenue_cents):
+    """Profit margin as a Decimal percentage, or None when there is no revenue."""
+    if not revenue_cents:
+        return None
+    return (Decimal(profit_cents) * 100 / Decimal(revenue_cents)).quantize(
+        MARGIN_PLACES, ROUND_HALF_UP)
+
+class ProfitSummary:
+    """Running revenue and cost totals, in cents, for one group of rows."""
+
+    __slots__ = ('rows', 'revenue', 'cost', 'zero_revenue_rows')
+
+    def __init__(self):
+        self.rows = 0
+        self.revenue = 0
+        self.cost = 0
+        self.zero_revenue_rows = 0
+
+    def add_block(self, revenues, costs):
+        self.rows += len(revenues)
+        self.revenue += sum(revenues)
+        self.cost += sum(costs)
+        self.zero_revenue_rows += revenues.count(0)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.revenue += other.revenue
+        self.cost += other.cost
+        self.zero_revenue_rows += other.zero_revenue_rows
+
+    @property
+    def profit(self):
+        return self.revenue - self.cost
+
+    @property
+    def margin(self):
+        return margin_percent(self.profit, self.revenue)
+
+def column_indexes(header, columns):
+    names = [name.strip().lower() for name in header]
+    try:
+        return [names.index(column.lower()) for column in columns]
+    except ValueError:
+        raise ValueError(f"CSV header must contain the columns {', '.join(columns)}")
+
+def summarise_csv(csv_file, chunk_rows=CHUNK_ROWS, store_column='store',
+                  date_column='date', revenue_column='revenue', cost_column='cost'):
+    """Stream csv_file once and total revenue and cost per (store, date).
+
+    A single csv.reader runs over the whole file, so quoted fields may span
+    lines, and its rows are taken in blocks of chunk_rows. Each block's rows
+    are grouped first and every group's amounts are converted and summed a
+    column at a time. Rows with missing fields or unparsable amounts are
+    skipped. Returns (groups, rows, skipped) where groups maps
+    (store, date) to a ProfitSummary.
+    """
+    groups = {}
+    rows = 0
+    skipped = 0
+
+    with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return groups, rows, skipped
+        store_i, date_i, revenue_i, cost_i = column_indexes(
+            header, (store_column, date_column, revenue_column, cost_column))
+        width = max(store_i, date_i, revenue_i, cost_i) + 1
+
+        while True:
+            block = {}
+            block_rows = 0
+            for row in islice(reader, chunk_rows):
+                block_rows += 1
+                if len(row) < width:
+                    if row:
+                        skipped += 1
+                    continue
+                key = (row[store_i].strip(), row[date_i].strip())
+                columns = block.get(key)
+                if columns is None:
+                    columns = block[key] = ([], [])
+                columns[0].append(row[revenue_i])
+                columns[1].append(row[cost_i])
+            if not block_rows:
+                break
+
+            for key, (revenue_texts, cost_texts) in block.items():
+                try:
+                    revenues = list(map(to_cents, revenue_texts))
+                    costs = list(map(to_cents, cost_texts))
+                except ValueError:
+                    # Fall back to row by row to drop only the bad rows.
+                    revenues = []
+                    costs = []
+                    for revenue_text, cost_text in zip(revenue_texts, cost_texts):
+                        try:
+                            revenue, cost = to_cents(revenue_text), to_cents(cost_text)
+                        except ValueError:
+                            skipped += 1
+                            continue
+                        revenues.append(revenue)
+                        costs.append(cost)
+
+                summary = groups.get(key)
+                if summary is None:
+                    summary = groups[key] = ProfitSummary()
+                summary.add_block(revenues, costs)
+                rows += len(revenues)
+
+    return groups, rows, skipped
+
+def group_by(groups, position):
+    """Merge (store, date) summaries by store (position 0) or date (1)."""
+    merged = {}
+    for key, summary in groups.items():
+        total = merged.get(key[position])
+        if total is None:
+            total = merged[key[position]] = ProfitSummary()
+        total.merge(summary)
+    return merged
+
+def format_margin(margin):
+    return "n/a" if margin is None else f"{margin:.1f}%"
+
+def print_summary_table(title, summaries):
+    print(f"\n--- {title} ---")
+    print(f"{'':<16} {'Rows':>10} {'Revenue':>16} {'Costs':>16} "
+          f"{'Profit':>16} {'Margin':>8}")
+    for name in sorted(summaries):
+        summary = summaries[name]
+        print(f"{name:<16} {summary.rows:>10,} {format_cents(summary.revenue):>16} "
+              f"{format_cents(summary.cost):>16} {format_cents(summary.profit):>16} "
+              f"{format_margin(summary.margin):>8}")
+
+def run_batch(csv_file, group='both'):
+    start = time.perf_counter()
+    groups, rows, skipped = summarise_csv(csv_file)
+    by_store = group_by(groups, 0)
+    by_day = group_by(groups, 1)
+    elapsed = time.perf_counter() - start
+
+    overall = ProfitSummary()
+    for summary in by_store.values():
+        overall.merge(summary)
+
+    if group in ('store', 'both'):
+        print_summary_table("Profit by Store", by_store)
+    if group in ('day', 'both'):
+        print_summary_table("Profit by Day", by_day)
+    if group == 'store-day':
+        print_summary_table("Profit by Store and Day",
+                            {f"{store} {day}": summary
+                             for (store, day), summary in groups.items()})
+
+    print("\n--- Financial Summary ---")
+    print(f"Rows: {rows:,} ({skipped:,} skipped, "
+          f"{overall.zero_revenue_rows:,} with zero revenue)")
+    print(f"Revenue: {format_cents(overall.revenue)}")
+    print(f"Costs: {format_cents(overall.cost)}")
+    print(f"Profit: {format_cents(overall.profit)}")
+    print(f"Profit Margin: {format_margin(overall.margin)}")
+    if elapsed > 0:
+        print(f"Throughput: {(rows + skipped) / elapsed:,.0f} rows/sec "
+              f"({elapsed:.2f}s)")
+
+def interactive():
+    # Get revenue from user
+    revenue = float(input("Enter total revenue: $"))
+    
+    # Get costs from user
+    costs = float(input("Enter total costs: $"))
+    
+    # Calculate profit
+    profit = revenue - costs
+    
+    # Display results
+    print("\n--- Financial Summary ---")
+    print(f"Revenue: ${revenue:,.2f}")
+    print(f"Costs: ${costs:,.2f}")
+    print(f"Profit: ${profit:,.2f}")
+    
+    # Calculate profit margin percentage (undefined without revenue)
+    if revenue:
+        margin = (profit / revenue) * 100
+        print(f"Profit Margin: {margin:.1f}%")
+    else:
+        print("Profit Margin: n/a (no revenue)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Profit and margin calculator")
+    parser.add_argument('csv_file', nargs='?',
+                        help="CSV with store, date, revenue and cost columns")
+    parser.add_argument('--group', choices=('store', 'day', 'both', 'store-day'), default='both',
+                        help="which grouped summaries to print (default: both)")
+    args = parser.parse_args()
+
+    if args.csv_file:
+        run_batch(args.csv_file, args.group)
+    else:
+        interactive()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Single entry point for all of the tools in this project.
+
+Usage: python cli.py [--metrics FILE] [--profile] [--trace-memory]
+                     <command> [options]
+
+Only the module behind the chosen command is imported, so starting one tool
+does not pay for loading the others (or their dependencies).
+
+--metrics writes the stage timers and counters recorded by the command to
+FILE when it finishes (Prometheus text format for .prom/.txt, JSON
+otherwise). --profile and --trace-memory add cProfile and tracemalloc
+output to the JSON export.
+"""
+import importlib
+import sys
+
+COMMANDS = {
+    'calculator': ('calculator', 'main', "Profit and margin calculator"),
+    'expenses': ('expense_tracker', 'main', "Expense tracker and ledger import"),
+    'files': ('file_manager', 'file_manager_demo', "File operations demo"),
+    'grades': ('student_grade_analyzer', 'main', "Interactive grade analyzer"),
+    'grade-stats': ('grade_analytics', 'main', "Grade statistics over CSV files"),
+    'library': ('library_system', 'main', "Library catalogue demo"),
+    'logins': ('login_attempts', 'main', "Failed login attempt check"),
+    'logs': ('server_log_analyzer', 'main', "Server log analysis"),
+    'music': ('music_library_manager', 'main', "Interactive music library"),
+    'network-scan': ('network_scan', 'main', "Risky open port scan"),
+    'passwords': ('password_validator', 'main', "Password validator and auditor"),
+    'pricing': ('product_pricing_manager', 'main', "Product pricing report"),
+    'school': ('school_management_system', 'main', "School management demo"),
+    'security-demo': ('demo_security_system', 'main', "User and IoT security demo"),
+    'weather': ('week11_eu_weather', 'main', "EU capitals weather collector"),
+}
+
+def print_usage():
+    print("Usage: python cli.py [--metrics FILE] [--profile] [--trace-memory] "
+          "<command> [options]\n")
+    print("Commands:")
+    for command, (module_name, function_name, description) in COMMANDS.items():
+        print(f"  {command:<15} {description}")
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    
+    metrics_file = None
+    profile = False
+    trace_memory = False
+    while argv and argv[0] in ('--metrics', '--profile', '--trace-memory'):
+        option = argv.pop(0)
+        if option == '--metrics':
+            if not argv:
+                print("--metrics requires a file name")
+                return 2
+            metrics_file = argv.pop(0)
+        elif option == '--profile':
+            profile = True
+        else:
+            trace_memory = True
+    
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return 0
+    
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n")
+        print_usage()
+        return 2
+    
+    if metrics_file or profile or trace_memory:
+        import metrics
+        metrics.enable(profile=profile, trace_memory=trace_memory)
+    
+    module_name, function_name, description = COMMANDS[command]
+    module = importlib.import_module(module_name)
+    
+    # Subcommands parse sys.argv themselves.
+    sys.argv = [f"{sys.argv[0]} {command}"] + argv[1:]
+    try:
+        getattr(module, function_name)()
+    finally:
+        if metrics_file or profile or trace_memory:
+            metrics.export(metrics_file or 'metrics.json')
+            print(f"Metrics written to {metrics_file or 'metrics.json'}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+"""Append-only expense ledger with running statistics.
+
+Expenses are stored in <path>.log as compact binary records: amounts are
+integer cents, dates are day ordinals and categories are small integer ids
+defined by their own records in the same log. Every record carries its
+length and a CRC32, so a torn write at the end of the log is cut off on the
+next open.
+
+Per-category count, total, minimum and maximum are updated as each expense
+is added, as are day, month and year rollups of spend per category. Both
+are saved to <path>.stats on checkpoint() and close(), so opening a ledger
+only replays the records written since then.
+"""
+import csv
+import json
+import os
+import struct
+import zlib
+from datetime import date, datetime, timedelta
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+LOG_MAGIC = b'EXPLOG01'
+RECORD_HEADER = struct.Struct('<IIB')
+CATEGORY_RECORD = struct.Struct('<H')
+EXPENSE_RECORD = struct.Struct('<qiH')
+
+OP_CATEGORY = 1
+OP_EXPENSE = 2
+CENT = Decimal('0.01')
+MAX_CENTS = 2 ** 63 - 1
+
+def parse_cents(text):
+    """Convert an amount such as '1,234.50' or '$12' to integer cents.
+
+    Raises ValueError for text that is not an amount, or one too large to
+    store in the ledger.
+    """
+    cleaned = text.strip().replace(',', '').replace('$', '')
+    try:
+        cents = int((Decimal(cleaned) / CENT).quantize(Decimal(1), ROUND_HALF_UP))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {text!r}")
+    if abs(cents) > MAX_CENTS:
+        raise ValueError(f"Amount out of range: {text!r}")
+    return cents
+
+def format_cents(cents):
+    sign = '-' if cents < 0 else ''
+    return f"{sign}${abs(cents) // 100:,}.{abs(cents) % 100:02d}"
+
+def month_key(day):
+    return day.year * 12 + day.month - 1
+
+def month_end(day):
+    if day.month == 12:
+        return date(day.year, 12, 31)
+    return date(day.year, day.month + 1, 1) - timedelta(days=1)
+
+def covering_buckets(start, end):
+    """Split [start, end] into the fewest whole year, month and day buckets.
+
+    Yields (level, key) pairs; keys match those used by ExpenseLedger's
+    rollups.
+    """
+    day = start
+    while day <= end:
+        if day.month == 1 and day.day == 1 and date(day.year, 12, 31) <= end:
+            yield 'year', day.year
+            last = date(day.year, 12, 31)
+        elif day.day == 1 and month_end(day) <= end:
+            yield 'month', month_key(day)
+            last = month_end(day)
+        else:
+            yield 'day', day.toordinal()
+            last = day
+        # Stop before stepping past end, which may be date.max.
+        if last >= end:
+            return
+        day = last + timedelta(days=1)
+
+def normalise_category(name):
+    return name.strip().capitalize() or 'Uncategorized'
+
+class CategoryStats:
+    """Running count/total/min/max for a set of amounts in cents."""
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self, count=0, total=0, minimum=None, maximum=None):
+        self.count = count
+        self.total = total
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def add(self, cents):
+        self.count += 1
+        self.total += cents
+        if self.minimum is None or cents < self.minimum:
+            self.minimum = cents
+        if self.maximum is None or cents > self.maximum:
+            self.maximum = cents
+
+    def merge(self, other):
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        if self.minimum is None or other.minimum < self.minimum:
+            self.minimum = other.minimum
+        if self.maximum is None or other.maximum > self.maximum:
+            self.maximum = other.maximum
+
+    @property
+    def average(self):
+        return self.total / self.count if self.count else 0
+
+    def to_list(self):
+        return [self.count, self.total, self.minimum, self.maximum]
+
+class ExpenseLedger:
+    """Persistent expense ledger; use ExpenseLedger(path) and close() it."""
+
+    def __init__(self, path):
+        self.log_path = path + '.log'
+        self.stats_path = path + '.stats'
+        self.category_ids = {}
+        self.category_names = []
+        self.category_stats = {}
+        self.rollups = {'day': {}, 'month': {}, 'year': {}}
+
+        if not os.path.exists(self.log_path):
+            with open(self.log_path, 'wb') as f:
+                f.write(LOG_MAGIC)
+        self.log = open(self.log_path, 'r+b')
+        if self.log.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise ValueError(f"{self.log_path} is not an expense ledger")
+
+        start = self.load_stats()
+        self.replay(start)
+
+    # -- opening ---------------------------------------------------------
+
+    def load_stats(self):
+        """Load the last checkpoint and return the log offset it covers."""
+        try:
+            with open(self.stats_path, 'r') as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return len(LOG_MAGIC)
+        if snapshot['log_end'] > os.path.getsize(self.log_path):
+            return len(LOG_MAGIC)
+
+        self.category_names = snapshot['categories']
+        self.category_ids = {name: i for i, name in enumerate(self.category_names)}
+        self.category_stats = {name: CategoryStats(*values)
+                               for name, values in snapshot['stats'].items()}
+        self.rollups = {level: {int(key): totals for key, totals in buckets.items()}
+                        for level, buckets in snapshot['rollups'].items()}
+        return snapshot['log_end']
+
+    def replay(self, start):
+        self.log.seek(start)
+        offset = start
+        while True:
+            header = self.log.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            length, crc, op = RECORD_HEADER.unpack(header)
+            payload = self.log.read(length)
+            if len(payload) < length or zlib.crc32(bytes([op]) + payload) != crc:
+                break
+            self.apply(op, payload)
+            offset += RECORD_HEADER.size + length
+
+        # Anything past the last complete record is a torn write.
+        self.log.truncate(offset)
+        self.log.seek(offset)
+
+    def apply(self, op, payload):
+        if op == OP_CATEGORY:
+            category_id, = CATEGORY_RECORD.unpack_from(payload)
+            name = payload[CATEGORY_RECORD.size:].decode('utf-8')
+            self.register_category(name, category_id)
+        elif op == OP_EXPENSE:
+            cents, day, category_id = EXPENSE_RECORD.unpack_from(payload)
+            self.record_stats(cents, day, self.category_names[category_id])
+
+    def register_category(self, name, category_id):
+        self.category_ids[name] = category_id
+        self.category_names.append(name)
+        self.category_stats[name] = CategoryStats()
+
+    def record_stats(self, cents, day, category):
+        self.category_stats[category].add(cents)
+
+        when = date.fromordinal(day)
+        for level, key in (('day', day), ('month', month_key(when)),
+                           ('year', when.year)):
+            totals = self.rollups[level].setdefault(key, {})
+            totals[category] = totals.get(category, 0) + cents
+
+    # -- writing ---------------------------------------------------------
+
+    def write_record(self, op, payload):
+        self.log.write(RECORD_HEADER.pack(len(payload),
+                                          zlib.crc32(bytes([op]) + payload), op))
+        self.log.write(payload)
+
+    def category_id(self, name):
+        category_id = self.category_ids.get(name)
+        if category_id is None:
+            category_id = len(self.category_names)
+            self.write_record(OP_CATEGORY, CATEGORY_RECORD.pack(category_id)
+                              + name.encode('utf-8'))
+            self.register_category(name, category_id)
+        return category_id
+
+    def write_expense(self, cents, category, description='', day=None):
+        if cents <= 0:
+            raise ValueError("Amount must be positive.")
+        if cents > MAX_CENTS:
+            raise ValueError("Amount is too large.")
+        category = normalise_category(category)
+        if day is None:
+            day = date.today()
+        category_id = self.category_id(category)
+        self.write_record(OP_EXPENSE,
+                          EXPENSE_RECORD.pack(cents, day.toordinal(), category_id)
+                          + description.encode('utf-8'))
+        self.record_stats(cents, day.toordinal(), category)
+
+    def commit(self):
+        """Flush buffered records to disk."""
+        self.log.flush()
+        os.fsync(self.log.fileno())
+
+    def add_expense(self, amount, category, description='', day=None):
+        """Record one expense; amount may be a string, Decimal or int cents."""
+        cents = amount if isinstance(amount, int) else parse_cents(str(amount))
+        self.write_expense(cents, category, description, day)
+        self.commit()
+
+    def import_csv(self, csv_file, date_column='Date', amount_column='Amount',
+                   category_column='Category', description_column='Description',
+                   date_format=None, debit_sign=-1, commit_every=100_000):
+        """Bulk-import a bank CSV export.
+
+        Only debits are imported, as positive amounts. Exports usually show
+        debits as negative numbers; pass debit_sign=1 for one that shows
+        them as positive. Credits (refunds, deposits), zero amounts and
+        unparsable rows are skipped. Dates are ISO 8601 unless date_format
+        (a strptime format) is given. Returns (imported, skipped).
+        """
+        if debit_sign not in (-1, 1):
+            raise ValueError("debit_sign must be -1 or 1")
+        imported = 0
+        skipped = 0
+        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+            # restval fills the missing fields of short rows with '' rather
+            # than None, so they fail parsing and are skipped.
+            for row in csv.DictReader(f, restval=''):
+                try:
+                    cents = parse_cents(row[amount_column]) * debit_sign
+                    date_text = row[date_column].strip()
+                    if date_format:
+                        day = datetime.strptime(date_text, date_format).date()
+                    else:
+                        day = date.fromisoformat(date_text)
+                    if cents <= 0:
+                        raise ValueError("credit or zero amount")
+                except (KeyError, ValueError, TypeError):
+                    skipped += 1
+                    continue
+
+                self.write_expense(cents, row.get(category_column) or '',
+                                   row.get(description_column) or '', day)
+                imported += 1
+                if imported % commit_every == 0:
+                    self.commit()
+
+        self.commit()
+        return imported, skipped
+
+    # -- reading ---------------------------------------------------------
+
+    def entries(self):
+        """Yield (cents, date, category, description) for every expense."""
+        self.log.flush()
+        with open(self.log_path, 'rb') as f:
+            f.seek(len(LOG_MAGIC))
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    break
+                length, crc, op = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if op == OP_EXPENSE:
+                    cents, day, category_id = EXPENSE_RECORD.unpack_from(payload)
+                    description = payload[EXPENSE_RECORD.size:].decode('utf-8')
+                    yield (cents, date.fromordinal(day),
+                           self.category_names[category_id], description)
+
+    def categories(self):
+        return sorted(self.category_stats)
+
+    def stats(self, category=None):
+        """Return CategoryStats for one category or for the whole ledger."""
+        if category is not None:
+            return self.category_stats.get(normalise_category(category),
+                                           CategoryStats())
+        overall = CategoryStats()
+        for stats in self.category_stats.values():
+            overall.merge(stats)
+        return overall
+
+    def range_totals(self, start, end):
+        """Return {category: cents} spent between start and end inclusive.
+
+        The range is covered with whole-year, then whole-month, then single
+        day rollups, so the cost depends on the number of buckets touched
+        rather than the number of expenses.
+        """
+        totals = {}
+        for level, key in covering_buckets(start, end):
+            for category, cents in self.rollups[level].get(key, {}).items():
+                totals[category] = totals.get(category, 0) + cents
+        return totals
+
+    def monthly_totals(self, start, end):
+        """Return [((year, month), {category: cents}), ...] for each month
+        overlapping [start, end], clipped to the range."""
+        months = []
+        day = start
+        while day <= end:
+            last = min(month_end(day), end)
+            months.append(((day.year, day.month), self.range_totals(day, last)))
+            if last >= end:
+                break
+            day = last + timedelta(days=1)
+        return months
+
+    def snapshot(self):
+        return {
+            'log_end': self.log.tell(),
+            'categories': self.category_names,
+            'stats': {name: stats.to_list()
+                      for name, stats in self.category_stats.items()},
+            'rollups': self.rollups,
+        }
+
+    def checkpoint(self):
+        """Save the running statistics so the next open skips the replay."""
+        self.commit()
+        temp_path = self.stats_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.stats_path)
+
+    def close(self):
+        self.checkpoint()
+        self.log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
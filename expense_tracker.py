@@ -1,84 +1,147 @@
-expenses = []
-category_totals = {}
-unique_categories = set()
+"""Personal expense tracker.
 
-print("Welcome to Personal Expense Tracker!\n")
+Run without arguments to type expenses in interactively. With --ledger,
+expenses are kept in a persistent ExpenseLedger instead: --import adds the
+debits from bank CSV exports, and the per-category statistics are printed
+from the ledger's running totals.
+"""
+import argparse
+import time
 
-num_expenses = 0
-while True:
-    try:
-        num_expenses_input = input("How many expenses do you want to enter? (Enter 0 to quit): ")
-        if num_expenses_input.lower() == 'q':
-            print("Exiting expense entry.")
-            break
-        num_expenses = int(num_expenses_input)
-        if num_expenses < 0:
-            print("Please enter a non-negative number.")
-            continue
-        break
-    except ValueError:
-        print("Invalid input. Please enter a number or 'q'.")
+from expense_ledger import ExpenseLedger, format_cents
 
-if num_expenses > 0:
-    for i in range(1, num_expenses + 1):
-        print(f"\nEntering Expense {i}:")
-        while True:
-            try:
-                amount_str = input("  Amount: $")
-                amount = float(amount_str)
-                if amount <= 0:
-                    print("Amount must be positive.")
-                    continue
+def interactive():
+    expenses = []
+    category_totals = {}
+    unique_categories = set()
+    total_spent = 0
+    highest_expense = 0
+    lowest_expense = 0
+    
+    print("Welcome to Personal Expense Tracker!\n")
+    
+    num_expenses = 0
+    while True:
+        try:
+            num_expenses_input = input("How many expenses do you want to enter? (Enter 0 to quit): ")
+            if num_expenses_input.lower() == 'q':
+                print("Exiting expense entry.")
                 break
-            except ValueError:
-                print("Invalid amount. Please enter a numerical value.")
-        
-        category = input("  Category (e.g., Food, Transport, Bills): ").strip().capitalize()
-        description = input("  Description (optional): ").strip()
-        
-        expense_tuple = (amount, category, description if description else "No description")
-        expenses.append(expense_tuple)
-        
-        category_totals[category] = category_totals.get(category, 0) + amount
-        unique_categories.add(category)
-    
-    if expenses:
-        all_amounts = [exp[0] for exp in expenses]
-        total_spent = sum(all_amounts)
-        highest_expense = max(all_amounts)
-        lowest_expense = min(all_amounts)
-        average_expense = total_spent / len(all_amounts)
-    else:
-        total_spent = 0
-        highest_expense = 0
-        lowest_expense = 0
-        average_expense = 0
+            num_expenses = int(num_expenses_input)
+            if num_expenses < 0:
+                print("Please enter a non-negative number.")
+                continue
+            break
+        except ValueError:
+            print("Invalid input. Please enter a number or 'q'.")
+    
+    if num_expenses > 0:
+        for i in range(1, num_expenses + 1):
+            print(f"\nEntering Expense {i}:")
+            while True:
+                try:
+                    amount_str = input("  Amount: $")
+                    amount = float(amount_str)
+                    if amount <= 0:
+                        print("Amount must be positive.")
+                        continue
+                    break
+                except ValueError:
+                    print("Invalid amount. Please enter a numerical value.")
+    
+            category = input("  Category (e.g., Food, Transport, Bills): ").strip().capitalize()
+            description = input("  Description (optional): ").strip()
+    
+            expense_tuple = (amount, category, description if description else "No description")
+            expenses.append(expense_tuple)
+    
+            category_totals[category] = category_totals.get(category, 0) + amount
+            unique_categories.add(category)
+            total_spent += amount
+            if len(expenses) == 1 or amount > highest_expense:
+                highest_expense = amount
+            if len(expenses) == 1 or amount < lowest_expense:
+                lowest_expense = amount
+    
+        average_expense = total_spent / len(expenses) if expenses else 0
     
-    print("\n" + "="*40)
-    print("=== YOUR EXPENSE REPORT ===")
-    print("="*40)
+        print("\n" + "="*40)
+        print("=== YOUR EXPENSE REPORT ===")
+        print("="*40)
     
-    if not expenses:
-        print("No expenses recorded for this session.")
+        if not expenses:
+            print("No expenses recorded for this session.")
+        else:
+            print("\n--- All Recorded Expenses ---")
+            for i, (amount, category, desc) in enumerate(expenses, 1):
+                print(f"{i}. ${amount:.2f} | Category: {category} | Description: {desc}")
+    
+            print("\n--- Spending by Category ---")
+            for category, total in sorted(category_totals.items()):
+                print(f"{category}: ${total:.2f}")
+    
+            print("\n--- Unique Categories Tracked ---")
+            print(", ".join(sorted(list(unique_categories))))
+            print(f"Total unique categories: {len(unique_categories)}")
+    
+            print("\n--- Expense Statistics ---")
+            print(f"Total Expenses: ${total_spent:.2f}")
+            print(f"Highest Single Expense: ${highest_expense:.2f}")
+            print(f"Lowest Single Expense: ${lowest_expense:.2f}")
+            print(f"Average Expense: ${average_expense:.2f}")
+    
+        print("\nThank you for using the Personal Expense Tracker!")
     else:
-        print("\n--- All Recorded Expenses ---")
-        for i, (amount, category, desc) in enumerate(expenses, 1):
-            print(f"{i}. ${amount:.2f} | Category: {category} | Description: {desc}")
-        
-        print("\n--- Spending by Category ---")
-        for category, total in sorted(category_totals.items()):
-            print(f"{category}: ${total:.2f}")
-        
-        print("\n--- Unique Categories Tracked ---")
-        print(", ".join(sorted(list(unique_categories))))
-        print(f"Total unique categories: {len(unique_categories)}")
-        
-        print("\n--- Expense Statistics ---")
-        print(f"Total Expenses: ${total_spent:.2f}")
-        print(f"Highest Single Expense: ${highest_expense:.2f}")
-        print(f"Lowest Single Expense: ${lowest_expense:.2f}")
-        print(f"Average Expense: ${average_expense:.2f}")
-    
-    print("\nThank you for using the Personal Expense Tracker!")
-else:
-    print("\nNo expenses were entered or processed.")
+        print("\nNo expenses were entered or processed.")
+
+def print_ledger_report(ledger):
+    print("\n--- Spending by Category ---")
+    for category in ledger.categories():
+        stats = ledger.stats(category)
+        print(f"{category}: {format_cents(stats.total)} "
+              f"({stats.count:,} expenses)")
+    
+    overall = ledger.stats()
+    print("\n--- Expense Statistics ---")
+    print(f"Expenses recorded: {overall.count:,}")
+    print(f"Total Expenses: {format_cents(overall.total)}")
+    if overall.count:
+        print(f"Highest Single Expense: {format_cents(overall.maximum)}")
+        print(f"Lowest Single Expense: {format_cents(overall.minimum)}")
+        print(f"Average Expense: {format_cents(round(overall.average))}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Personal expense tracker")
+    parser.add_argument('--ledger', metavar='PATH',
+                        help="use the persistent ledger at PATH.log / PATH.stats")
+    parser.add_argument('--import', dest='import_files', nargs='+', metavar='FILE',
+                        help="import the debits from bank CSV exports (needs --ledger)")
+    parser.add_argument('--date-format',
+                        help="strptime format of the CSV dates (default: ISO 8601)")
+    parser.add_argument('--debits-positive', action='store_true',
+                        help="the CSV shows debits as positive amounts")
+    args = parser.parse_args()
+    
+    if not args.ledger:
+        if args.import_files:
+            parser.error("--import needs --ledger")
+        interactive()
+        return
+    
+    with ExpenseLedger(args.ledger) as ledger:
+        for csv_file in args.import_files or []:
+            start = time.perf_counter()
+            try:
+                imported, skipped = ledger.import_csv(
+                    csv_file, date_format=args.date_format,
+                    debit_sign=1 if args.debits_positive else -1)
+            except FileNotFoundError:
+                print(f"File not found: {csv_file}")
+                continue
+            elapsed = time.perf_counter() - start
+            print(f"Imported {imported:,} expenses from {csv_file} "
+                  f"({skipped:,} rows skipped) in {elapsed:.2f}s")
+        print_ledger_report(ledger)
+
+if __name__ == "__main__":
+    main()
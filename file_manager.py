@@ -44,4 +44,5 @@ def file_manager_demo():
     print(f"✓ Removed folder: {folder_name}")
     print("\nAll cleanup completed successfully!")
 
-file_manager_demo()
+if __name__ == "__main__":
+    file_manager_demo()
@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
 
+import metrics
+
 class Device:
     def __init__(self, device_id, device_type, owner, firmware_version='1.0.0'):
         self.__device_id = device_id
@@ -96,9 +98,11 @@ class DeviceManager:
             return None
         
         report = []
-        for device_id, device in self.__devices.items():
-            info = device.get_device_info()
-            device.check_compliance()
-            report.append(info)
+        with metrics.timer('devices.analyze'):
+            for device_id, device in self.__devices.items():
+                info = device.get_device_info()
+                device.check_compliance()
+                report.append(info)
+        metrics.count('devices.scanned', len(report))
         
         return report
@@ -0,0 +1,598 @@
+"""Persistent storage backend for library_system.Library.
+
+A store is two files:
+
+    <path>.log  append-only log of add/delete records. Every record carries
+                its length and a CRC32, so a torn write at the end of the
+                file is detected and cut off the next time the store opens.
+    <path>.idx  compacted index written by checkpoint()/compact(): the log
+                offset of every book slot, on-disk hash tables for ISBN and
+                normalised title lookups, the ISBN, normalised title and
+                normalised author of every slot, and the sorted slot
+                postings of every 1-3 character substring of the titles and
+                authors. It is memory-mapped on open.
+
+Opening a store maps the index and replays only the log records written
+after the last checkpoint, so start-up time does not grow with the size of
+the catalogue. Searches read keys and postings from the index, so they do
+not load books either; books are read from the log only when they are
+accessed. The gram directory is parsed the first time a search needs it.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from collections import OrderedDict
+
+LOG_MAGIC = b'LIBLOG01'
+LOG_HEADER = struct.Struct('<8s8s')
+RECORD_HEADER = struct.Struct('<IIB')
+INDEX_MAGIC = b'LIBIDX02'
+INDEX_HEADER = struct.Struct('<8s8sQQQQQQQ')
+SLOT_FORMAT = struct.Struct('<q')
+KEY_FIELDS = ('isbn', 'title', 'author')
+TEXT_FIELDS = ('title', 'author')
+
+OP_ADD = 1
+OP_DELETE = 2
+FIELD_SEPARATOR = '\x1f'
+CACHE_SIZE = 4096
+
+def key_hash(text):
+    digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def table_size_for(count):
+    size = 16
+    while size < count * 2:
+        size *= 2
+    return size
+
+def insert_keys(table, keyed_slots):
+    """Insert (text, slot) pairs into an open-addressing table of slot + 1."""
+    mask = len(table) - 1
+    for text, slot in keyed_slots:
+        position = key_hash(text) & mask
+        while table[position]:
+            position = (position + 1) & mask
+        table[position] = slot + 1
+
+def normalise(text):
+    return " ".join(text.lower().split())
+
+def index_grams(text):
+    """Every distinct substring of text one to three characters long."""
+    return {text[i:i + n] for n in (1, 2, 3) for i in range(len(text) - n + 1)}
+
+def add_postings(grams_index, text, slot):
+    for gram in index_grams(text):
+        slots = grams_index.get(gram)
+        if slots is None:
+            slots = grams_index[gram] = array('I')
+        slots.append(slot)
+
+class KeyView:
+    """Sequence view of one key column of a store; deleted slots read None."""
+
+    def __init__(self, store, field):
+        self.store = store
+        self.field = field
+
+    def __len__(self):
+        return len(self.store)
+
+    def __getitem__(self, slot):
+        return self.store.key(self.field, slot)
+
+class PostingsView:
+    """Mapping-style view of a store's gram postings for one text field."""
+
+    def __init__(self, store, field):
+        self.store = store
+        self.field = field
+
+    def get(self, gram):
+        return self.store.postings(self.field, gram)
+
+class BookStore:
+    """Crash-safe, lazily loaded book storage.
+
+    Slots are numbered in the order books were added. A deleted slot reads
+    back as None until the store is compacted, which renumbers the live
+    books densely.
+    """
+
+    def __init__(self, path, book_factory=None):
+        if book_factory is None:
+            from library_system import Book
+            book_factory = Book
+        self.path = path
+        self.log_path = path + '.log'
+        self.index_path = path + '.idx'
+        self.book_factory = book_factory
+        self.cache = OrderedDict()
+
+        self.open_log()
+        self.load_index()
+        self.replay_log(self.index_log_end)
+
+    # -- opening ---------------------------------------------------------
+
+    def open_log(self):
+        if not os.path.exists(self.log_path):
+            with open(self.log_path, 'wb') as f:
+                f.write(LOG_HEADER.pack(LOG_MAGIC, os.urandom(8)))
+                f.flush()
+                os.fsync(f.fileno())
+
+        self.log = open(self.log_path, 'r+b')
+        magic, self.generation = LOG_HEADER.unpack(self.log.read(LOG_HEADER.size))
+        if magic != LOG_MAGIC:
+            raise ValueError(f"{self.log_path} is not a library log")
+
+    def load_index(self):
+        self.index_map = None
+        self.index_log_end = LOG_HEADER.size
+        self.index_slots = 0
+        self.index_live = 0
+        self.table_size = 0
+        self.index_offsets = None
+        self.isbn_table = None
+        self.title_table = None
+        self.key_offsets = {}
+        self.key_starts = {}
+        self.postings_start = 0
+        self.directory_range = None
+        self.gram_directory = None
+
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb') as f:
+            index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, generation, log_end, slots, live, table_size, postings_start,
+         directory_start, directory_length) = INDEX_HEADER.unpack_from(index_map)
+        if magic != INDEX_MAGIC or generation != self.generation:
+            # Stale index from before a compaction that did not finish, or
+            # from an older format; fall back to replaying the whole log.
+            index_map.close()
+            return
+
+        self.index_map = index_map
+        self.index_log_end = log_end
+        self.index_slots = slots
+        self.index_live = live
+        self.table_size = table_size
+        self.postings_start = postings_start
+        self.directory_range = (directory_start, directory_start + directory_length)
+
+        words = slots + 2 * table_size + len(KEY_FIELDS) * (slots + 1)
+        view = memoryview(index_map)[INDEX_HEADER.size:
+                                     INDEX_HEADER.size + 8 * words].cast('q')
+        self.index_offsets = view[:slots]
+        self.isbn_table = view[slots:slots + table_size]
+        self.title_table = view[slots + table_size:slots + 2 * table_size]
+
+        position = slots + 2 * table_size
+        key_start = INDEX_HEADER.size + 8 * words
+        for field in KEY_FIELDS:
+            offsets = view[position:position + slots + 1]
+            self.key_offsets[field] = offsets
+            self.key_starts[field] = key_start
+            key_start += offsets[slots]
+            position += slots + 1
+
+    def replay_log(self, start):
+        """Apply log records written after the index was checkpointed."""
+        self.new_offsets = []
+        self.new_isbns = {}
+        self.new_titles = {}
+        self.new_keys = {field: [] for field in KEY_FIELDS}
+        self.new_grams = {field: {} for field in TEXT_FIELDS}
+        self.deleted = set()
+        self.live_count = self.index_live
+
+        self.log.seek(start)
+        offset = start
+        while True:
+            header = self.log.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                break
+            length, crc, op = RECORD_HEADER.unpack(header)
+            payload = self.log.read(length)
+            if len(payload) < length or zlib.crc32(bytes([op]) + payload) != crc:
+                break
+
+            if op == OP_ADD:
+                title, author, isbn = payload.decode('utf-8').split(FIELD_SEPARATOR)
+                self.record_added(offset, title, author, isbn)
+            elif op == OP_DELETE:
+                slot, = SLOT_FORMAT.unpack(payload)
+                self.cache.pop(slot, None)
+                self.deleted.add(slot)
+                self.live_count -= 1
+            offset += RECORD_HEADER.size + length
+
+        # Anything past the last complete record is a torn write.
+        self.log.truncate(offset)
+        self.log_end = offset
+
+    def record_added(self, offset, title, author, isbn):
+        """Index a book added since the last checkpoint and return its slot."""
+        slot = len(self)
+        title_key = normalise(title)
+        author_key = normalise(author)
+        self.new_offsets.append(offset)
+        self.new_isbns[isbn] = slot
+        self.new_titles.setdefault(title_key, []).append(slot)
+        self.new_keys['isbn'].append(isbn)
+        self.new_keys['title'].append(title_key)
+        self.new_keys['author'].append(author_key)
+        add_postings(self.new_grams['title'], title_key, slot)
+        add_postings(self.new_grams['author'], author_key, slot)
+        self.live_count += 1
+        return slot
+
+    # -- reading ---------------------------------------------------------
+
+    def __len__(self):
+        return self.index_slots + len(self.new_offsets)
+
+    def record_offset(self, slot):
+        if slot >= self.index_slots:
+            return self.new_offsets[slot - self.index_slots]
+        return self.index_offsets[slot]
+
+    def read_book(self, offset):
+        length, crc, op = RECORD_HEADER.unpack(
+            os.pread(self.log.fileno(), RECORD_HEADER.size, offset))
+        payload = os.pread(self.log.fileno(), length, offset + RECORD_HEADER.size)
+        title, author, isbn = payload.decode('utf-8').split(FIELD_SEPARATOR)
+        return self.book_factory(title, author, isbn)
+
+    def __getitem__(self, slot):
+        if slot < 0 or slot >= len(self):
+            raise IndexError("slot out of range")
+        if slot in self.deleted:
+            return None
+        offset = self.record_offset(slot)
+        if offset < 0:
+            return None
+
+        book = self.cache.get(slot)
+        if book is None:
+            book = self.read_book(offset)
+            self.cache[slot] = book
+            if len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(slot)
+        return book
+
+    def key(self, field, slot):
+        """Return the ISBN or normalised title/author of a slot, or None if
+        the slot is deleted. Reads the index, never the log."""
+        if slot in self.deleted:
+            return None
+        if slot >= self.index_slots:
+            return self.new_keys[field][slot - self.index_slots]
+        if self.index_offsets[slot] < 0:
+            return None
+        offsets = self.key_offsets[field]
+        start = self.key_starts[field]
+        return self.index_map[start + offsets[slot]:
+                              start + offsets[slot + 1]].decode('utf-8')
+
+    def keys(self, field):
+        return KeyView(self, field)
+
+    def load_gram_directory(self):
+        if self.gram_directory is None:
+            if self.directory_range is None:
+                self.gram_directory = {field: {} for field in TEXT_FIELDS}
+            else:
+                start, end = self.directory_range
+                self.gram_directory = json.loads(self.index_map[start:end])
+        return self.gram_directory
+
+    def stored_postings(self, field, gram):
+        """Return the checkpointed postings of a gram as bytes."""
+        entry = self.load_gram_directory()[field].get(gram)
+        if entry is None:
+            return b''
+        start = self.postings_start + 4 * entry[0]
+        return self.index_map[start:start + 4 * entry[1]]
+
+    def postings(self, field, gram):
+        """Return the sorted slots whose field contains gram, as array('I').
+
+        Deleted slots may still appear; their keys read back as None. The
+        result is a copy, so it stays valid across checkpoints.
+        """
+        slots = array('I', self.stored_postings(field, gram))
+        new_slots = self.new_grams[field].get(gram)
+        if new_slots:
+            slots.extend(new_slots)
+        return slots
+
+    def grams(self, field):
+        return PostingsView(self, field)
+
+    def probe(self, table, text):
+        """Yield live slots stored under text's hash in an on-disk table."""
+        if not self.table_size:
+            return
+        mask = self.table_size - 1
+        position = key_hash(text) & mask
+        while table[position]:
+            slot = table[position] - 1
+            if slot not in self.deleted and self.index_offsets[slot] >= 0:
+                yield slot
+            position = (position + 1) & mask
+
+    def slot_for_isbn(self, isbn):
+        slot = self.new_isbns.get(isbn)
+        if slot is not None and slot not in self.deleted:
+            return slot
+        for slot in self.probe(self.isbn_table, isbn):
+            if self.key('isbn', slot) == isbn:
+                return slot
+        return None
+
+    def slots_for_title(self, title_key):
+        slots = [slot for slot in self.probe(self.title_table, title_key)
+                 if self.key('title', slot) == title_key]
+        slots.sort()
+        slots.extend(slot for slot in self.new_titles.get(title_key, [])
+                     if slot not in self.deleted)
+        return slots
+
+    # -- writing ---------------------------------------------------------
+
+    def write_record(self, op, payload):
+        record = RECORD_HEADER.pack(len(payload),
+                                    zlib.crc32(bytes([op]) + payload), op)
+        offset = self.log_end
+        self.log.seek(offset)
+        self.log.write(record + payload)
+        self.log.flush()
+        os.fsync(self.log.fileno())
+        self.log_end = offset + len(record) + len(payload)
+        return offset
+
+    def append(self, book):
+        payload = FIELD_SEPARATOR.join(
+            (book.title, book.author, book.isbn)).encode('utf-8')
+        offset = self.write_record(OP_ADD, payload)
+        return self.record_added(offset, book.title, book.author, book.isbn)
+
+    def delete(self, slot):
+        if self[slot] is None:
+            raise KeyError(f"slot {slot} is empty")
+        self.write_record(OP_DELETE, SLOT_FORMAT.pack(slot))
+        self.cache.pop(slot, None)
+        self.deleted.add(slot)
+        self.live_count -= 1
+
+    def __setitem__(self, slot, value):
+        if value is not None:
+            raise ValueError("Use append() to add books")
+        self.delete(slot)
+
+    # -- checkpoints -----------------------------------------------------
+
+    def write_index(self, generation, log_end, offsets, live, isbn_table,
+                    title_table, key_columns, postings):
+        """Write a complete index file and move it into place.
+
+        key_columns maps each of KEY_FIELDS to (end offsets, list of encoded
+        keys); postings maps each of TEXT_FIELDS to {gram: [bytes, ...]}
+        holding native uint32 slot arrays.
+        """
+        slots = len(offsets)
+        key_bytes = sum(columns[0][-1] for columns in key_columns.values())
+        postings_start = (INDEX_HEADER.size
+                          + 8 * (slots + 2 * len(isbn_table)
+                                 + len(KEY_FIELDS) * (slots + 1))
+                          + key_bytes)
+
+        directory = {}
+        position = 0
+        for field in TEXT_FIELDS:
+            entries = directory[field] = {}
+            for gram, chunks in postings[field].items():
+                count = sum(len(chunk) for chunk in chunks) // 4
+                entries[gram] = [position, count]
+                position += count
+        directory_data = json.dumps(directory, ensure_ascii=False,
+                                    separators=(',', ':')).encode('utf-8')
+        directory_start = postings_start + 4 * position
+
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, generation, log_end, slots,
+                                      live, len(isbn_table), postings_start,
+                                      directory_start, len(directory_data)))
+            offsets.tofile(f)
+            isbn_table.tofile(f)
+            title_table.tofile(f)
+            for field in KEY_FIELDS:
+                key_columns[field][0].tofile(f)
+            for field in KEY_FIELDS:
+                f.writelines(key_columns[field][1])
+            for field in TEXT_FIELDS:
+                for chunks in postings[field].values():
+                    f.writelines(chunks)
+            f.write(directory_data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.index_path)
+
+    def release_index(self):
+        if self.index_map is not None:
+            self.index_offsets.release()
+            self.isbn_table.release()
+            self.title_table.release()
+            for offsets in self.key_offsets.values():
+                offsets.release()
+            self.index_map.close()
+            self.index_map = None
+
+    def reload(self):
+        self.release_index()
+        self.cache.clear()
+        self.load_index()
+        self.replay_log(self.index_log_end)
+
+    def merged_key_columns(self):
+        """Checkpointed key columns with the keys of new books appended."""
+        columns = {}
+        for field in KEY_FIELDS:
+            ends = array('q')
+            chunks = []
+            if self.index_map is not None:
+                ends.frombytes(self.key_offsets[field].tobytes())
+                start = self.key_starts[field]
+                chunks.append(self.index_map[start:start + ends[-1]])
+            else:
+                ends.append(0)
+            end = ends[-1]
+            for key in self.new_keys[field]:
+                data = key.encode('utf-8')
+                end += len(data)
+                ends.append(end)
+                chunks.append(data)
+            columns[field] = (ends, chunks)
+        return columns
+
+    def merged_postings(self):
+        """Checkpointed postings with the slots of new books appended.
+
+        Slots of new books are all higher than checkpointed ones, so
+        appending keeps every list sorted.
+        """
+        postings = {}
+        for field in TEXT_FIELDS:
+            merged = postings[field] = {}
+            for gram in self.load_gram_directory()[field]:
+                merged[gram] = [self.stored_postings(field, gram)]
+            for gram, slots in self.new_grams[field].items():
+                merged.setdefault(gram, []).append(slots.tobytes())
+        return postings
+
+    def checkpoint(self):
+        """Fold the records since the last checkpoint into the index file.
+
+        While the hash tables stay at most half full only the new books are
+        inserted into copies of the existing tables; otherwise the tables are
+        rebuilt at double size from the key columns, so neither path reads
+        books from the log. Deleted slots keep their keys and postings until
+        the next compaction.
+        """
+        slots = len(self)
+        offsets = array('q')
+        if self.index_map is not None:
+            offsets.frombytes(self.index_offsets.tobytes())
+        offsets.extend(self.new_offsets)
+        for slot in self.deleted:
+            offsets[slot] = -1
+
+        if self.index_map is not None and slots * 2 <= self.table_size:
+            isbn_table = array('q', self.isbn_table.tobytes())
+            title_table = array('q', self.title_table.tobytes())
+            new_keys = [(isbn, slot) for isbn, slot in self.new_isbns.items()
+                        if slot not in self.deleted]
+            insert_keys(isbn_table, new_keys)
+            insert_keys(title_table,
+                        [(title_key, slot)
+                         for title_key, title_slots in self.new_titles.items()
+                         for slot in title_slots if slot not in self.deleted])
+        else:
+            table_size = table_size_for(slots)
+            isbn_table = array('q', bytes(8 * table_size))
+            title_table = array('q', bytes(8 * table_size))
+            live_slots = [slot for slot in range(slots)
+                          if self.key('isbn', slot) is not None]
+            insert_keys(isbn_table, [(self.key('isbn', slot), slot)
+                                     for slot in live_slots])
+            insert_keys(title_table, [(self.key('title', slot), slot)
+                                      for slot in live_slots])
+
+        self.write_index(self.generation, self.log_end, offsets,
+                         self.live_count, isbn_table, title_table,
+                         self.merged_key_columns(), self.merged_postings())
+        self.reload()
+
+    def compact(self):
+        """Rewrite the log without deleted books and renumber the slots.
+
+        The new log and index are written to temporary files and moved into
+        place with os.replace, log first. The index records the log's
+        generation id, so if we crash between the two renames the old index
+        is recognised as stale and ignored on the next open.
+        """
+        generation = os.urandom(8)
+        temp_log = self.log_path + '.tmp'
+        offsets = array('q')
+        isbn_keys = []
+        title_keys = []
+        key_columns = {field: (array('q', [0]), []) for field in KEY_FIELDS}
+        grams = {field: {} for field in TEXT_FIELDS}
+
+        with open(temp_log, 'wb') as f:
+            f.write(LOG_HEADER.pack(LOG_MAGIC, generation))
+            offset = LOG_HEADER.size
+            for slot in range(len(self)):
+                book = self[slot]
+                if book is None:
+                    continue
+                payload = FIELD_SEPARATOR.join(
+                    (book.title, book.author, book.isbn)).encode('utf-8')
+                f.write(RECORD_HEADER.pack(len(payload),
+                                           zlib.crc32(bytes([OP_ADD]) + payload),
+                                           OP_ADD))
+                f.write(payload)
+
+                new_slot = len(offsets)
+                keys = {'isbn': book.isbn, 'title': normalise(book.title),
+                        'author': normalise(book.author)}
+                for field, key in keys.items():
+                    ends, chunks = key_columns[field]
+                    data = key.encode('utf-8')
+                    ends.append(ends[-1] + len(data))
+                    chunks.append(data)
+                for field in TEXT_FIELDS:
+                    add_postings(grams[field], keys[field], new_slot)
+                isbn_keys.append((keys['isbn'], new_slot))
+                title_keys.append((keys['title'], new_slot))
+                offsets.append(offset)
+                offset += RECORD_HEADER.size + len(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        table_size = table_size_for(len(offsets))
+        isbn_table = array('q', bytes(8 * table_size))
+        title_table = array('q', bytes(8 * table_size))
+        insert_keys(isbn_table, isbn_keys)
+        insert_keys(title_table, title_keys)
+        postings = {field: {gram: [slots.tobytes()]
+                            for gram, slots in grams[field].items()}
+                    for field in TEXT_FIELDS}
+
+        self.release_index()
+        self.log.close()
+        os.replace(temp_log, self.log_path)
+        self.write_index(generation, offset, offsets, len(offsets),
+                         isbn_table, title_table, key_columns, postings)
+
+        self.open_log()
+        self.reload()
+
+    def close(self):
+        if self.new_offsets or self.deleted:
+            self.checkpoint()
+        self.release_index()
+        self.log.close()
@@ -1,3 +1,9 @@
+import os
+from array import array
+from bisect import bisect_left
+
+from library_storage import BookStore, index_grams
+
 class Book:
     def __init__(self, title, author, isbn):
         self.title = title
@@ -7,55 +13,318 @@ class Book:
     def display_info(self):
         return f"'{self.title}' by {self.author} (ISBN: {self.isbn})"
 
+def normalise(text):
+    return " ".join(text.lower().split())
+
+def query_grams(term):
+    """The grams to look up for a search term: its trigrams, or the term
+    itself when it is shorter than three characters."""
+    if len(term) < 3:
+        return {term} if term else set()
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+def intersect_sorted(postings, start=0):
+    """Yield, in order, the slots from `start` on present in every sorted
+    posting list.
+
+    The shortest list drives the walk and the others are searched with
+    bisect from where the previous match left off, so results stream out
+    without building the full intersection, and resuming at a cursor costs
+    one bisect per list rather than a walk over the earlier slots.
+    """
+    postings = sorted(postings, key=len)
+    first, rest = postings[0], postings[1:]
+    positions = [bisect_left(slots, start) for slots in rest]
+    for index in range(bisect_left(first, start), len(first)):
+        slot = first[index]
+        for i, slots in enumerate(rest):
+            position = bisect_left(slots, slot, positions[i])
+            positions[i] = position
+            if position == len(slots) or slots[position] != slot:
+                break
+        else:
+            yield slot
+
 class Library:
-    def __init__(self, name):
+    """Book catalogue with hash and trigram indexes.
+
+    Books live in a list of slots; removing a book leaves a None tombstone
+    so no other slot has to move. Lookups by ISBN and exact title go through
+    dicts. Substring searches on title or author intersect the sorted
+    posting arrays of the term's trigrams (or of the whole term, for one or
+    two characters) and check the candidates against the normalised keys.
+    Postings are only ever appended to; a removed book stays in them until
+    the next compaction and is skipped because its key is None.
+
+    A library opened with Library.open() keeps its books in a persistent
+    BookStore instead. The store answers ISBN and title lookups and
+    searches from its on-disk index, which also holds the normalised keys
+    and gram postings, and loads books lazily, only when they are returned.
+    """
+    
+    COMPACT_MIN_TOMBSTONES = 1024
+    
+    def __init__(self, name, store=None):
         self.name = name
-        self.books = []
+        self.store = store
+        self.reset_indexes()
+    
+    @classmethod
+    def open(cls, path, name=None):
+        """Open (or create) a library persisted at path.log / path.idx."""
+        store = BookStore(path, book_factory=Book)
+        return cls(name or os.path.basename(path), store)
+    
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+    
+    def reset_indexes(self):
+        if self.store is None:
+            self.books = []
+            self.book_count = 0
+            self.isbn_index = {}
+            self.title_index = {}
+            self.title_keys = []
+            self.author_keys = []
+            self.title_grams = {}
+            self.author_grams = {}
+        else:
+            self.books = self.store
+            self.book_count = self.store.live_count
+    
+    def __len__(self):
+        return self.book_count
+    
+    def index_text(self, grams_index, text, slot):
+        # Slots are handed out in increasing order, so appending keeps
+        # every posting array sorted.
+        for gram in index_grams(text):
+            slots = grams_index.get(gram)
+            if slots is None:
+                slots = grams_index[gram] = array('I')
+            slots.append(slot)
+    
+    def isbn_slot(self, isbn):
+        if self.store is not None:
+            return self.store.slot_for_isbn(isbn)
+        return self.isbn_index.get(isbn)
+    
+    def title_slots(self, title_key):
+        if self.store is not None:
+            return self.store.slots_for_title(title_key)
+        return self.title_index.get(title_key, [])
     
     def add_book(self, book):
-        self.books.append(book)
+        if self.isbn_slot(book.isbn) is not None:
+            return f"Book with ISBN {book.isbn} already exists."
+        
+        if self.store is not None:
+            self.store.append(book)
+        else:
+            title_key = normalise(book.title)
+            author_key = normalise(book.author)
+            slot = len(self.books)
+            self.books.append(book)
+            self.isbn_index[book.isbn] = slot
+            self.title_index.setdefault(title_key, []).append(slot)
+            self.title_keys.append(title_key)
+            self.author_keys.append(author_key)
+            self.index_text(self.title_grams, title_key, slot)
+            self.index_text(self.author_grams, author_key, slot)
+        self.book_count += 1
         return f"Added: {book.display_info()}"
     
+    def remove_slot(self, slot):
+        book = self.books[slot]
+        
+        if self.store is not None:
+            self.store.delete(slot)
+        else:
+            title_key = normalise(book.title)
+            del self.isbn_index[book.isbn]
+            title_slots = self.title_index[title_key]
+            title_slots.remove(slot)
+            if not title_slots:
+                del self.title_index[title_key]
+            self.books[slot] = None
+            self.title_keys[slot] = None
+            self.author_keys[slot] = None
+        self.book_count -= 1
+        
+        tombstones = len(self.books) - self.book_count
+        if (tombstones >= self.COMPACT_MIN_TOMBSTONES
+                and tombstones > self.book_count):
+            self.compact()
+        return book
+    
     def remove_book(self, title):
-        for book in self.books:
-            if book.title.lower() == title.lower():
-                self.books.remove(book)
-                return f"Removed: {book.display_info()}"
-        return f"Book '{title}' not found."
+        slots = self.title_slots(normalise(title))
+        if not slots:
+            return f"Book '{title}' not found."
+        
+        book = self.remove_slot(slots[0])
+        return f"Removed: {book.display_info()}"
+    
+    def remove_by_isbn(self, isbn):
+        slot = self.isbn_slot(isbn)
+        if slot is None:
+            return f"No book with ISBN {isbn}."
+        
+        book = self.remove_slot(slot)
+        return f"Removed: {book.display_info()}"
+    
+    def compact(self):
+        """Drop tombstones and rebuild the indexes with dense slots."""
+        if self.store is not None:
+            self.store.compact()
+            self.reset_indexes()
+            return
+        
+        books = [book for book in self.books if book is not None]
+        self.reset_indexes()
+        for book in books:
+            self.add_book(book)
+    
+    def find_by_isbn(self, isbn):
+        slot = self.isbn_slot(isbn)
+        return self.books[slot] if slot is not None else None
+    
+    def find_by_title(self, title):
+        return [self.books[slot] for slot in self.title_slots(normalise(title))]
+    
+    def iter_matching_slots(self, search_term, field='title', start=0):
+        """Yield, in catalogue order, the slots from `start` on whose key
+        contains the search term. Only the keys are read, never the books.
+        """
+        grams_index, keys = self.search_indexes(field)
+        term = normalise(search_term)
+        grams = query_grams(term)
+        
+        if not grams:
+            for slot in range(start, len(keys)):
+                if keys[slot] is not None:
+                    yield slot
+            return
+        
+        postings = []
+        for gram in grams:
+            slots = grams_index.get(gram)
+            if not slots:
+                return
+            postings.append(slots)
+        
+        for slot in intersect_sorted(postings, start):
+            key = keys[slot]
+            if key is not None and term in key:
+                yield slot
+    
+    def matching_slots(self, search_term, field='title'):
+        return list(self.iter_matching_slots(search_term, field))
+    
+    def search_indexes(self, field):
+        if self.store is not None:
+            if field not in ('title', 'author'):
+                raise ValueError(f"Cannot search by '{field}'")
+            return self.store.grams(field), self.store.keys(field)
+        if field == 'title':
+            return self.title_grams, self.title_keys
+        if field == 'author':
+            return self.author_grams, self.author_keys
+        raise ValueError(f"Cannot search by '{field}'")
+    
+    def iter_books(self, start=0):
+        """Yield (slot, book) for every live book from slot `start` on."""
+        books = self.books
+        for slot in range(start, len(books)):
+            book = books[slot]
+            if book is not None:
+                yield slot, book
+    
+    def iter_search(self, search_term, field='title', start=0):
+        """Yield (slot, book) for matching books, loading each one lazily."""
+        for slot in self.iter_matching_slots(search_term, field, start):
+            yield slot, self.books[slot]
+    
+    def list_page(self, cursor=0, limit=20):
+        """Return (books, next_cursor) for one page of the catalogue.
+
+        Pass next_cursor back in to fetch the following page; it is None
+        once the catalogue is exhausted. Only the books on the page are
+        touched.
+        """
+        return take_page(self.iter_books(cursor), limit)
+    
+    def search_page(self, search_term, field='title', cursor=0, limit=20):
+        """Return (books, next_cursor) for one page of search results."""
+        return take_page(self.iter_search(search_term, field, cursor), limit)
+    
+    def listing_lines(self):
+        yield f"\n=== Books in {self.name} ===\n"
+        for i, (slot, book) in enumerate(self.iter_books(), 1):
+            yield f"{i}. {book.display_info()}\n"
+    
+    def write_books(self, out, chunk_lines=1000):
+        """Stream the full listing to a file-like object in chunks."""
+        if not self.book_count:
+            out.write(f"{self.name} has no books.")
+            return
+        write_chunked(out, self.listing_lines(), chunk_lines)
     
     def list_books(self):
-        if not self.books:
+        if not self.book_count:
             return f"{self.name} has no books."
-        
-        result = f"\n=== Books in {self.name} ===\n"
-        for i, book in enumerate(self.books, 1):
-            result += f"{i}. {book.display_info()}\n"
-        return result
+        return "".join(self.listing_lines())
     
     def search_by_title(self, search_term):
-        found = [book for book in self.books
-                 if search_term.lower() in book.title.lower()]
+        found = self.matching_slots(search_term)
         
         if found:
-            result = f"\nFound {len(found)} book(s):\n"
-            for book in found:
-                result += f"- {book.display_info()}\n"
-            return result
+            lines = [f"\nFound {len(found)} book(s):\n"]
+            lines.extend(f"- {self.books[slot].display_info()}\n"
+                         for slot in found)
+            return "".join(lines)
         return f"No books found matching '{search_term}'"
+    
+    def search_by_author(self, search_term):
+        return [book for slot, book in self.iter_search(search_term, 'author')]
 
-library = Library("City Library")
-
-book1 = Book("Python Crash Course", "Eric Matthes", "978-1593279288")
-book2 = Book("Clean Code", "Robert Martin", "978-0132350884")
-book3 = Book("The Pragmatic Programmer", "Hunt & Thomas", "978-0201616224")
-
-print(library.add_book(book1))
-print(library.add_book(book2))
-print(library.add_book(book3))
+def take_page(slot_books, limit):
+    books = []
+    for slot, book in slot_books:
+        if len(books) == limit:
+            return books, slot
+        books.append(book)
+    return books, None
 
-print(library.list_books())
+def write_chunked(out, lines, chunk_lines=1000):
+    """Write lines to out, joining them into chunks of chunk_lines."""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_lines:
+            out.write("".join(chunk))
+            chunk = []
+    if chunk:
+        out.write("".join(chunk))
 
-print(library.search_by_title("Python"))
+def main():
+    library = Library("City Library")
+    
+    book1 = Book("Python Crash Course", "Eric Matthes", "978-1593279288")
+    book2 = Book("Clean Code", "Robert Martin", "978-0132350884")
+    book3 = Book("The Pragmatic Programmer", "Hunt & Thomas", "978-0201616224")
+    
+    print(library.add_book(book1))
+    print(library.add_book(book2))
+    print(library.add_book(book3))
+    
+    print(library.list_books())
+    
+    print(library.search_by_title("Python"))
+    
+    print(library.remove_book("Clean Code"))
+    print(library.list_books())
 
-print(library.remove_book("Clean Code"))
-print(library.list_books())
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+import time
+from collections import OrderedDict, deque
+
 login_attempts = [
     ("alice", "success"),
     ("bob", "failed"),
@@ -7,20 +10,83 @@ login_attempts = [
     ("alice", "failed")
 ]
 
-print("Checking login attempts...")
-failed_counts = {}
+class LoginMonitor:
+    """Single-pass failed-login detector over an event stream.
 
-# Count failed login attempts
-for username, status in login_attempts:
-    if status == "failed":
-        if username in failed_counts:
-            failed_counts[username] = failed_counts[username] + 1
+    Each user's failures are kept in a deque of timestamps covering the last
+    window_seconds; older entries expire as new events arrive. An alert is
+    produced the moment a user's failure count in the window reaches the
+    threshold. Only the latest threshold timestamps are kept per user, which
+    is all that decides whether the count is at the threshold, so a user
+    failing in a tight loop costs no more memory than one at the threshold.
+    Memory is bounded overall by evicting the least recently active user
+    once more than max_users are being tracked.
+    """
+    
+    def __init__(self, threshold=3, window_seconds=300, max_users=100_000):
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.max_users = max_users
+        self.failures = OrderedDict()
+        self.events = 0
+        self.alerts = 0
+    
+    def process(self, username, status, timestamp=None):
+        """Handle one event and return an alert message or None."""
+        self.events += 1
+        if status != "failed":
+            return None
+        if timestamp is None:
+            timestamp = time.monotonic()
+        
+        failures = self.failures.get(username)
+        if failures is None:
+            failures = self.failures[username] = deque(maxlen=self.threshold)
+            if len(self.failures) > self.max_users:
+                self.failures.popitem(last=False)
         else:
-            failed_counts[username] = 1
+            self.failures.move_to_end(username)
+        
+        cutoff = timestamp - self.window_seconds
+        while failures and failures[0] <= cutoff:
+            failures.popleft()
+        # A full deque means the window already held threshold failures and
+        # this user has been alerted for them.
+        already_alerted = len(failures) == self.threshold
+        failures.append(timestamp)
+        
+        if not already_alerted and len(failures) == self.threshold:
+            self.alerts += 1
+            return ("ALERT: User '" + username + "' has " + str(len(failures))
+                    + " failed login attempts")
+        return None
+    
+    def stream(self, events):
+        """Yield alerts for an iterable of (username, status[, timestamp])."""
+        process = self.process
+        for event in events:
+            alert = process(*event)
+            if alert is not None:
+                yield alert
+    
+    def failure_count(self, username, now=None):
+        """Return the user's recent failures, counting at most threshold."""
+        failures = self.failures.get(username)
+        if not failures:
+            return 0
+        if now is None:
+            return len(failures)
+        cutoff = now - self.window_seconds
+        return sum(1 for timestamp in failures if timestamp > cutoff)
 
-# Check for accounts that failed 3 or more times
-for username in failed_counts:
-    if failed_counts[username] >= 3:
-        print("ALERT: User '" + username + "' has " + str(failed_counts[username]) + " failed login attempts")
+def main():
+    print("Checking login attempts...")
+    monitor = LoginMonitor(threshold=3)
+    
+    for alert in monitor.stream(login_attempts):
+        print(alert)
+    
+    print("Security check complete")
 
-print("Security check complete")
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,228 @@
-songs = []
-genre_count = {}
+"""Music library with a genre index and running top-genre rankings.
 
-print("Welcome to Music Library Manager!\n")
+Tracks are numbered in the order they are added. Genre names are interned,
+so millions of tracks share one string object per genre, and each genre
+keeps an array of its track ids. The most popular genres are kept in a
+small heap that is adjusted as each track is added, so asking for the top
+genres never recounts the library.
 
-for i in range(1, 6):
-    print(f"Enter Song {i}:")
-    song_name = input("  Song name: ")
-    genre = input("  Genre: ")
-    print()
+Tracks can be typed in interactively or imported from "name,genre" CSV
+files.
+"""
+import argparse
+import csv
+import sys
+import time
+from array import array
+
+class GenreRanking:
+    """The k genres with the most tracks, kept in an indexed min-heap.
+
+    Genres are identified by small integer ids. The heap holds the current
+    top k with the weakest at the root, and position maps a genre id to its
+    heap slot, so adding a track to any genre costs O(log k). Ties are
+    broken in favour of the genre seen first.
+    """
+
+    def __init__(self, k=10):
+        self.k = k
+        self.counts = []
+        self.heap = []
+        self.position = {}
+
+    def key(self, genre_id):
+        return self.counts[genre_id], -genre_id
+
+    def increment(self, genre_id):
+        if genre_id == len(self.counts):
+            self.counts.append(0)
+        self.counts[genre_id] += 1
+
+        slot = self.position.get(genre_id)
+        if slot is not None:
+            # A larger count moves the genre away from the root.
+            self.sift_down(slot)
+        elif len(self.heap) < self.k:
+            self.heap.append(genre_id)
+            self.position[genre_id] = len(self.heap) - 1
+            self.sift_up(len(self.heap) - 1)
+        elif self.k and self.key(genre_id) > self.key(self.heap[0]):
+            del self.position[self.heap[0]]
+            self.heap[0] = genre_id
+            self.position[genre_id] = 0
+            self.sift_down(0)
+
+    def sift_up(self, slot):
+        heap = self.heap
+        genre_id = heap[slot]
+        key = self.key(genre_id)
+        while slot:
+            parent = (slot - 1) // 2
+            if self.key(heap[parent]) <= key:
+                break
+            heap[slot] = heap[parent]
+            self.position[heap[slot]] = slot
+            slot = parent
+        heap[slot] = genre_id
+        self.position[genre_id] = slot
+
+    def sift_down(self, slot):
+        heap = self.heap
+        size = len(heap)
+        genre_id = heap[slot]
+        key = self.key(genre_id)
+        while True:
+            child = 2 * slot + 1
+            if child >= size:
+                break
+            if child + 1 < size and self.key(heap[child + 1]) < self.key(heap[child]):
+                child += 1
+            if key <= self.key(heap[child]):
+                break
+            heap[slot] = heap[child]
+            self.position[heap[slot]] = slot
+            slot = child
+        heap[slot] = genre_id
+        self.position[genre_id] = slot
+
+    def top(self):
+        """Return [(genre_id, count), ...], most tracks first."""
+        ranked = sorted(self.heap, key=self.key, reverse=True)
+        return [(genre_id, self.counts[genre_id]) for genre_id in ranked]
+
+class MusicLibrary:
+    """Track catalogue indexed by genre."""
+
+    def __init__(self, top_k=10):
+        self.names = []
+        self.track_genres = array('I')
+        self.genre_names = []
+        self.genre_ids = {}
+        self.genre_tracks = []
+        self.ranking = GenreRanking(top_k)
+
+    def __len__(self):
+        return len(self.names)
+
+    def genre_id(self, genre):
+        genre_id = self.genre_ids.get(genre)
+        if genre_id is None:
+            genre = sys.intern(genre)
+            genre_id = len(self.genre_names)
+            self.genre_ids[genre] = genre_id
+            self.genre_names.append(genre)
+            self.genre_tracks.append(array('I'))
+        return genre_id
+
+    def add_track(self, name, genre):
+        """Add a track and return its id."""
+        track_id = len(self.names)
+        genre_id = self.genre_id(genre)
+        self.names.append(name)
+        self.track_genres.append(genre_id)
+        self.genre_tracks[genre_id].append(track_id)
+        self.ranking.increment(genre_id)
+        return track_id
+
+    def track(self, track_id):
+        """Return (name, genre) for a track id."""
+        return self.names[track_id], self.genre_names[self.track_genres[track_id]]
+
+    def tracks(self):
+        for track_id in range(len(self.names)):
+            yield self.track(track_id)
+
+    def tracks_in_genre(self, genre):
+        """Return the ids of every track in genre, in the order added."""
+        genre_id = self.genre_ids.get(genre)
+        if genre_id is None:
+            return array('I')
+        return self.genre_tracks[genre_id]
+
+    def genre_counts(self):
+        """Return {genre: track count} in the order genres were first seen."""
+        return {genre: len(self.genre_tracks[genre_id])
+                for genre_id, genre in enumerate(self.genre_names)}
+
+    def top_genres(self, k=None):
+        """Return [(genre, count), ...] for the most popular genres.
+
+        k may not exceed the top_k the library was created with.
+        """
+        top = self.ranking.top()
+        if k is not None:
+            if k > self.ranking.k:
+                raise ValueError(f"Only the top {self.ranking.k} genres are tracked")
+            top = top[:k]
+        return [(self.genre_names[genre_id], count) for genre_id, count in top]
+
+    def import_csv(self, csv_file):
+        """Add the tracks in a "name,genre" CSV file; the genre is the last
+        column. A "name,genre" header row and short rows are skipped.
+        Returns (imported, skipped)."""
+        imported = 0
+        skipped = 0
+        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.reader(f):
+                if len(row) < 2 or not row[-1].strip():
+                    skipped += bool(row)
+                    continue
+                if not imported and [cell.strip().lower()
+                                     for cell in row] == ['name', 'genre']:
+                    continue
+                self.add_track(','.join(row[:-1]), row[-1].strip())
+                imported += 1
+        return imported, skipped
+
+def interactive(library):
+    print("Welcome to Music Library Manager!\n")
+    
+    for i in range(1, 6):
+        print(f"Enter Song {i}:")
+        song_name = input("  Song name: ")
+        genre = input("  Genre: ")
+        print()
+    
+        library.add_track(song_name, genre)
     
-    song_tuple = (song_name, genre)
-    songs.append(song_tuple)
+    print("=== YOUR MUSIC LIBRARY ===")
+    for index, (name, genre) in enumerate(library.tracks(), 1):
+        print(f"{index}. {name} ({genre})")
     
-    genre_count[genre] = genre_count.get(genre, 0) + 1
+    print("\n=== GENRE STATISTICS ===")
+    for genre, count in library.genre_counts().items():
+        print(f"{genre}: {count} songs")
+    
+    most_popular = library.top_genres(1)[0][0]
+    print(f"\nMost popular genre: {most_popular}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Music library manager")
+    parser.add_argument('--import', dest='import_files', nargs='+', metavar='FILE',
+                        help='import tracks from "name,genre" CSV files')
+    parser.add_argument('--top', type=int, default=10,
+                        help="number of top genres to show (default: 10)")
+    args = parser.parse_args()
+
+    library = MusicLibrary(top_k=max(args.top, 1))
+    if not args.import_files:
+        interactive(library)
+        return
 
-print("=== YOUR MUSIC LIBRARY ===")
-for index, (name, genre) in enumerate(songs, 1):
-    print(f"{index}. {name} ({genre})")
+    start = time.perf_counter()
+    skipped = 0
+    for csv_file in args.import_files:
+        try:
+            skipped += library.import_csv(csv_file)[1]
+        except FileNotFoundError:
+            print(f"File not found: {csv_file}")
+    elapsed = time.perf_counter() - start
 
-print("\n=== GENRE STATISTICS ===")
-for genre, count in genre_count.items():
-    print(f"{genre}: {count} songs")
+    print(f"Imported {len(library):,} tracks in {len(library.genre_names):,} genres "
+          f"({skipped:,} rows skipped) in {elapsed:.2f}s")
+    print(f"\n=== TOP {args.top} GENRES ===")
+    for rank, (genre, count) in enumerate(library.top_genres(args.top), 1):
+        print(f"{rank}. {genre}: {count:,} songs")
 
-most_popular = max(genre_count, key=genre_count.get)
-print(f"\nMost popular genre: {most_popular}")
+if __name__ == "__main__":
+    main()
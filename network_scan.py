@@ -1,3 +1,9 @@
+import argparse
+import asyncio
+import ipaddress
+import time
+from collections import Counter
+
 devices = [
     ("192.168.1.10", [22, 80, 443]),
     ("192.168.1.11", [21, 22, 80]),
@@ -6,14 +12,318 @@ devices = [
 
 risky_ports = [21, 23, 3389]
 
-print("Scanning network devices...")
-risk_count = 0
+# Open ports are kept as a 65536-bit bitmap in a Python int (bit n set means
+# port n is open), so checking a host against every risky port is a single
+# AND with the risky-port mask.
+
+def ports_to_bitmap(ports):
+    bitmap = 0
+    for port in ports:
+        bitmap |= 1 << port
+    return bitmap
+
+def bitmap_to_ports(bitmap):
+    ports = []
+    while bitmap:
+        lowest = bitmap & -bitmap
+        ports.append(lowest.bit_length() - 1)
+        bitmap ^= lowest
+    return ports
+
+def parse_ports(spec):
+    """Parse a port list such as '22,80,8000-8100'."""
+    ports = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            ports.extend(range(int(first), int(last) + 1))
+        else:
+            ports.append(int(part))
+    for port in ports:
+        if not 0 <= port <= 65535:
+            raise ValueError(f"Invalid port: {port}")
+    return ports
+
+def expand_targets(targets):
+    """Yield host addresses for a list of IPs, hostnames and CIDR blocks."""
+    for target in targets:
+        if '/' in target:
+            network = ipaddress.ip_network(target, strict=False)
+            if network.num_addresses == 1:
+                yield str(network.network_address)
+            else:
+                yield from (str(host) for host in network.hosts())
+        else:
+            yield target
+
+class ScanAnalysis:
+    """Aggregates risky open ports per port and per subnet."""
+
+    def __init__(self, risky, subnet_prefix=24):
+        self.risky_mask = ports_to_bitmap(risky)
+        self.subnet_prefix = subnet_prefix
+        self.hosts = 0
+        self.risky_hosts = 0
+        self.risk_count = 0
+        self.by_port = Counter()
+        self.by_subnet = Counter()
+
+    def add_host(self, ip, open_bitmap):
+        """Record one host and return its risky open ports."""
+        self.hosts += 1
+        hits = open_bitmap & self.risky_mask
+        if not hits:
+            return []
+
+        ports = bitmap_to_ports(hits)
+        self.risky_hosts += 1
+        self.risk_count += len(ports)
+        self.by_port.update(ports)
+        try:
+            subnet = ipaddress.ip_network(f"{ip}/{self.subnet_prefix}", strict=False)
+            self.by_subnet[str(subnet)] += len(ports)
+        except ValueError:
+            self.by_subnet[ip] += len(ports)
+        return ports
 
-for ip, open_ports in devices:
-    for port in open_ports:
-        for risky_port in risky_ports:
-            if port == risky_port:
+    def print_summary(self):
+        print(f"Hosts analysed: {self.hosts}")
+        print(f"Hosts with risky ports: {self.risky_hosts}")
+        if self.by_port:
+            print("\nRisky ports by port:")
+            for port, count in self.by_port.most_common():
+                print(f"  {port}: {count} hosts")
+            print(f"\nRisky ports by /{self.subnet_prefix} subnet:")
+            for subnet, count in self.by_subnet.most_common():
+                print(f"  {subnet}: {count}")
+
+def parse_result_line(line):
+    """Return (ip, open_bitmap) for a results line, or None for a host line
+    with no port list. Raises ValueError or IndexError if it is malformed."""
+    if line.startswith('Host:'):
+        if 'Ports:' not in line:
+            return None
+        ip = line.split()[1]
+        ports = []
+        ports_field = line.split('Ports:', 1)[1].split('\t')[0]
+        for entry in ports_field.split(','):
+            fields = entry.strip().split('/')
+            if len(fields) > 1 and fields[1] == 'open':
+                ports.append(fields[0])
+        return ip, ports_to_bitmap(parse_ports(','.join(ports)))
+
+    parts = line.split(None, 1)
+    ports = parse_ports(parts[1]) if len(parts) > 1 else []
+    return parts[0], ports_to_bitmap(ports)
+
+def load_scan_results(path, bad_lines=None):
+    """Yield (ip, open_bitmap) for each host in a scan results file.
+
+    Understands nmap grepable output (-oG), where a host line looks like
+    "Host: 10.0.0.5 ()	Ports: 22/open/tcp//ssh///, 80/closed/tcp//http///",
+    as well as simple "ip port,port,..." lines. Malformed lines are skipped;
+    their line numbers are appended to bad_lines if it is given.
+    """
+    with open(path, 'r', errors='replace') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+
+            try:
+                result = parse_result_line(line)
+            except (IndexError, ValueError):
+                if bad_lines is not None:
+                    bad_lines.append(line_number)
+                continue
+            if result is not None:
+                yield result
+
+def analyse_results(results, risky, subnet_prefix=24, verbose=True):
+    analysis = ScanAnalysis(risky, subnet_prefix)
+    for ip, bitmap in results:
+        for port in analysis.add_host(ip, bitmap):
+            if verbose:
                 print("WARNING: " + ip + " has risky port " + str(port) + " open")
-                risk_count = risk_count + 1
+    return analysis
+
+class AdaptiveLimiter:
+    """Concurrency limit that backs off when probes start timing out.
+
+    The limit grows by roughly one slot per window of successful probes and
+    is halved (at most once per timeout period) when a probe times out, the
+    same additive-increase/multiplicative-decrease scheme TCP uses.
+    """
+
+    def __init__(self, limit, minimum=1, backoff_interval=1.0):
+        self.maximum = limit
+        self.minimum = minimum
+        self.limit = float(limit)
+        self.active = 0
+        self.backoff_interval = backoff_interval
+        self.last_backoff = 0.0
+        self.condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+
+    async def release(self, timed_out):
+        async with self.condition:
+            self.active -= 1
+            now = asyncio.get_running_loop().time()
+            if timed_out:
+                if now - self.last_backoff >= self.backoff_interval:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self.last_backoff = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+async def probe_port(host, port, timeout):
+    """Try a TCP connect and return 'open', 'closed', 'timeout' or 'error'.
+
+    'error' means the host name itself is unusable, e.g. it cannot be
+    IDNA-encoded (UnicodeError is a ValueError).
+    """
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port), timeout)
+    except asyncio.TimeoutError:
+        return 'timeout'
+    except OSError:
+        return 'closed'
+    except ValueError:
+        return 'error'
+
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return 'open'
+
+async def probe_hosts(hosts, ports, concurrency=200, timeout=1.0,
+                      host_timeout=None):
+    """Probe every (host, port) pair and yield (host, port, state) results
+    as they complete.
+
+    At most `concurrency` connects are in flight, fewer while the adaptive
+    limiter is backing off. Once a host has been probed for host_timeout
+    seconds its remaining ports are skipped.
+    """
+    limiter = AdaptiveLimiter(concurrency)
+    queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    deadlines = {}
+    pairs = ((host, port) for host in hosts for port in ports)
+    done = object()
+
+    async def worker():
+        # Always report done, even if a probe raises, so the consumer below
+        # never waits for a worker that has already died.
+        try:
+            for host, port in pairs:
+                if host_timeout is not None:
+                    deadline = deadlines.setdefault(host, loop.time() + host_timeout)
+                    if loop.time() > deadline:
+                        continue
+                await limiter.acquire()
+                state = 'timeout'
+                try:
+                    state = await probe_port(host, port, timeout)
+                finally:
+                    await limiter.release(state == 'timeout')
+                await queue.put((host, port, state))
+        finally:
+            await queue.put(done)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    remaining = len(workers)
+    try:
+        while remaining:
+            item = await queue.get()
+            if item is done:
+                remaining -= 1
+            else:
+                yield item
+        # Re-raise anything a worker died of rather than losing it below.
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+async def probe_and_analyse(targets, ports, risky, concurrency=200, timeout=1.0,
+                            host_timeout=None, subnet_prefix=24):
+    """Probe targets, printing risky open ports as soon as they are found,
+    then feed each host's open-port bitmap into a ScanAnalysis."""
+    risky_mask = ports_to_bitmap(risky)
+    open_ports = {}
+    probed = 0
+
+    async for host, port, state in probe_hosts(expand_targets(targets), ports,
+                                               concurrency, timeout, host_timeout):
+        probed += 1
+        bitmap = open_ports.setdefault(host, 0)
+        if state == 'open':
+            open_ports[host] = bitmap | (1 << port)
+            if risky_mask >> port & 1:
+                print("WARNING: " + host + " has risky port " + str(port) + " open")
+
+    analysis = ScanAnalysis(risky, subnet_prefix)
+    for host, bitmap in open_ports.items():
+        analysis.add_host(host, bitmap)
+    return analysis, open_ports, probed
+
+def main():
+    parser = argparse.ArgumentParser(description="Check hosts for risky open ports")
+    parser.add_argument('--results', metavar='FILE',
+                        help="analyse nmap grepable (-oG) or 'ip port,...' results")
+    parser.add_argument('--probe', nargs='+', metavar='TARGET',
+                        help="TCP-connect probe these hosts or CIDR blocks")
+    parser.add_argument('--ports', default='1-1024,3389',
+                        help="ports to probe (default: 1-1024,3389)")
+    parser.add_argument('--risky', default=','.join(map(str, risky_ports)),
+                        help="ports treated as risky")
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--timeout', type=float, default=1.0,
+                        help="connect timeout per probe in seconds")
+    parser.add_argument('--host-timeout', type=float,
+                        help="stop probing a host after this many seconds")
+    parser.add_argument('--subnet-prefix', type=int, default=24)
+    args = parser.parse_args()
+    risky = parse_ports(args.risky)
+
+    print("Scanning network devices...")
+    start = time.perf_counter()
+
+    if args.probe:
+        analysis, open_ports, probed = asyncio.run(probe_and_analyse(
+            args.probe, parse_ports(args.ports), risky, args.concurrency,
+            args.timeout, args.host_timeout, args.subnet_prefix))
+        elapsed = time.perf_counter() - start
+        print(f"Probed {probed} ports in {elapsed:.2f}s "
+              f"({probed / elapsed if elapsed else 0:,.0f} probes/sec)")
+    elif args.results:
+        bad_lines = []
+        analysis = analyse_results(load_scan_results(args.results, bad_lines),
+                                   risky, args.subnet_prefix)
+        if bad_lines:
+            print(f"Skipped {len(bad_lines)} malformed lines "
+                  f"(first at line {bad_lines[0]})")
+    else:
+        analysis = analyse_results(
+            ((ip, ports_to_bitmap(open_ports)) for ip, open_ports in devices),
+            risky, args.subnet_prefix)
+
+    print("Scan complete: " + str(analysis.risk_count) + " security risks found")
+    if args.probe or args.results:
+        analysis.print_summary()
 
-print("Scan complete: " + str(risk_count) + " security risks found")
+if __name__ == "__main__":
+    main()
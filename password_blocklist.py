@@ -0,0 +1,164 @@
+"""Memory-mapped blocklist of breached/common passwords.
+
+An index is built offline from a plain text file with one password per line
+and is stored as two files next to each other:
+
+    <prefix>.bloom   Bloom filter header + bit array, answers "definitely not
+                     present" for most passwords without touching the hashes
+    <prefix>.hashes  sorted, de-duplicated 64-bit password hashes used to
+                     confirm Bloom filter hits exactly
+
+Opening a Blocklist only memory-maps the two files, so startup cost does not
+depend on the size of the list.
+"""
+import bisect
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+BLOOM_MAGIC = b'PWBLOOM1'
+BLOOM_HEADER = struct.Struct('<8sQQQ')
+MASK64 = (1 << 64) - 1
+
+def password_key(password):
+    """Return the 64-bit hash stored in the index for a password."""
+    digest = hashlib.blake2b(password.encode('utf-8', 'surrogateescape'),
+                             digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def bloom_positions(key, num_bits, num_hashes):
+    # Double hashing: the second hash is a mixed copy of the key, forced odd
+    # so the probe sequence never collapses onto a single bit.
+    step = (((key * 0x9E3779B97F4A7C15) & MASK64) >> 17) | 1
+    return [(key + i * step) % num_bits for i in range(num_hashes)]
+
+def bloom_size(count, error_rate):
+    count = max(count, 1)
+    num_bits = math.ceil(-count * math.log(error_rate) / (math.log(2) ** 2))
+    num_bits = max(64, (num_bits + 7) // 8 * 8)
+    num_hashes = max(1, round(num_bits / count * math.log(2)))
+    return num_bits, num_hashes
+
+def write_run(keys, temp_dir):
+    keys = array('Q', sorted(keys))
+    fd, path = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        keys.tofile(f)
+    return path
+
+def read_run(path, block_size=65536):
+    with open(path, 'rb') as f:
+        while True:
+            keys = array('Q')
+            keys.frombytes(f.read(8 * block_size))
+            if not keys:
+                break
+            yield from keys
+
+def build_blocklist(source_file, index_prefix, error_rate=0.001,
+                    run_size=5_000_000):
+    """Build a blocklist index from a file with one password per line.
+
+    Hashes are sorted in runs of run_size entries and merged from disk, so
+    memory use is bounded by the run size plus the Bloom filter itself.
+    Returns the number of distinct entries written.
+    """
+    temp_dir = tempfile.mkdtemp(prefix='blocklist_',
+                                dir=os.path.dirname(os.path.abspath(index_prefix)))
+    runs = []
+    try:
+        keys = []
+        with open(source_file, 'r', encoding='utf-8',
+                  errors='surrogateescape') as f:
+            for line in f:
+                password = line.rstrip('\r\n')
+                if not password:
+                    continue
+                keys.append(password_key(password))
+                if len(keys) >= run_size:
+                    runs.append(write_run(keys, temp_dir))
+                    keys = []
+        if keys:
+            runs.append(write_run(keys, temp_dir))
+        total = sum(os.path.getsize(run) // 8 for run in runs)
+
+        num_bits, num_hashes = bloom_size(total, error_rate)
+        bits = bytearray(num_bits // 8)
+        count = 0
+        previous = None
+        block = array('Q')
+
+        with open(index_prefix + '.hashes', 'wb') as f:
+            for key in heapq.merge(*(read_run(run) for run in runs)):
+                if key == previous:
+                    continue
+                previous = key
+                block.append(key)
+                for position in bloom_positions(key, num_bits, num_hashes):
+                    bits[position >> 3] |= 1 << (position & 7)
+                if len(block) >= 65536:
+                    block.tofile(f)
+                    count += len(block)
+                    block = array('Q')
+            block.tofile(f)
+            count += len(block)
+
+        with open(index_prefix + '.bloom', 'wb') as f:
+            f.write(BLOOM_HEADER.pack(BLOOM_MAGIC, num_bits, num_hashes, count))
+            f.write(bits)
+
+        return count
+
+    finally:
+        for run in runs:
+            os.remove(run)
+        os.rmdir(temp_dir)
+
+class Blocklist:
+    """Read-only, memory-mapped view of a blocklist index."""
+
+    def __init__(self, index_prefix):
+        with open(index_prefix + '.bloom', 'rb') as f:
+            self.bloom = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.num_bits, self.num_hashes, self.count = \
+            BLOOM_HEADER.unpack_from(self.bloom)
+        if magic != BLOOM_MAGIC:
+            raise ValueError(f"{index_prefix}.bloom is not a blocklist index")
+
+        self.hash_map = None
+        self.hashes = []
+        if self.count:
+            with open(index_prefix + '.hashes', 'rb') as f:
+                self.hash_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.hashes = memoryview(self.hash_map).cast('Q')
+
+    def __contains__(self, password):
+        key = password_key(password)
+        bloom = self.bloom
+        offset = BLOOM_HEADER.size
+        for position in bloom_positions(key, self.num_bits, self.num_hashes):
+            if not bloom[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+
+        i = bisect.bisect_left(self.hashes, key)
+        return i < len(self.hashes) and self.hashes[i] == key
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        if self.hash_map is not None:
+            self.hashes.release()
+            self.hash_map.close()
+        self.bloom.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
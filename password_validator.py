@@ -1,33 +1,155 @@
+import argparse
+import multiprocessing
 import string
 import random
+import time
+from collections import Counter
+
+from password_blocklist import Blocklist, build_blocklist
+
+RULES = ['min_length', 'has_uppercase', 'has_lowercase', 'has_digit',
+         'has_special']
+
+# Maps every character we care about to a marker for its class, so a single
+# str.translate pass tells us which classes a password contains. ASCII
+# letters are all mapped, so an 'U', 'L', 'D' or 'S' in the output can only
+# come from the table.
+CLASS_TABLE = str.maketrans(
+    {**{c: 'U' for c in string.ascii_uppercase},
+     **{c: 'L' for c in string.ascii_lowercase},
+     **{c: 'D' for c in string.digits},
+     **{c: 'S' for c in string.punctuation}}
+)
+
+def char_classes(password):
+    return set(password.translate(CLASS_TABLE))
 
 def check_min_length(password, min_len=8):
     return len(password) >= min_len
 
 def has_uppercase(password):
-    return any(char in string.ascii_uppercase for char in password)
+    return 'U' in char_classes(password)
 
 def has_lowercase(password):
-    return any(char in string.ascii_lowercase for char in password)
+    return 'L' in char_classes(password)
 
 def has_digit(password):
-    return any(char in string.digits for char in password)
+    return 'D' in char_classes(password)
 
 def has_special_char(password):
-    return any(char in string.punctuation for char in password)
+    return 'S' in char_classes(password)
 
-def validate_password(password):
+def validate_password(password, blocklist=None):
+    classes = char_classes(password)
     results = {
         'min_length': check_min_length(password),
-        'has_uppercase': has_uppercase(password),
-        'has_lowercase': has_lowercase(password),
-        'has_digit': has_digit(password),
-        'has_special': has_special_char(password)
+        'has_uppercase': 'U' in classes,
+        'has_lowercase': 'L' in classes,
+        'has_digit': 'D' in classes,
+        'has_special': 'S' in classes
     }
+    if blocklist is not None:
+        results['not_breached'] = password not in blocklist
     results['is_valid'] = all(results.values())
     return results
 
-def main():
+_worker_blocklist = None
+
+def init_audit_worker(blocklist_prefix):
+    global _worker_blocklist
+    _worker_blocklist = Blocklist(blocklist_prefix) if blocklist_prefix else None
+
+def audit_block(passwords):
+    """Validate a block of passwords and count failures per rule."""
+    failures = Counter()
+    invalid = 0
+    blocklist = _worker_blocklist
+    table = CLASS_TABLE
+    
+    for password in passwords:
+        classes = set(password.translate(table))
+        failed = False
+        if len(password) < 8:
+            failures['min_length'] += 1
+            failed = True
+        if 'U' not in classes:
+            failures['has_uppercase'] += 1
+            failed = True
+        if 'L' not in classes:
+            failures['has_lowercase'] += 1
+            failed = True
+        if 'D' not in classes:
+            failures['has_digit'] += 1
+            failed = True
+        if 'S' not in classes:
+            failures['has_special'] += 1
+            failed = True
+        if blocklist is not None and password in blocklist:
+            failures['not_breached'] += 1
+            failed = True
+        if failed:
+            invalid += 1
+    
+    return len(passwords), invalid, failures
+
+def read_password_blocks(password_file, block_size):
+    with open(password_file, 'r', encoding='utf-8',
+              errors='surrogateescape') as f:
+        block = []
+        for line in f:
+            block.append(line.rstrip('\r\n'))
+            if len(block) >= block_size:
+                yield block
+                block = []
+        if block:
+            yield block
+
+def audit_passwords(password_file, workers=1, blocklist_prefix=None,
+                    block_size=50_000):
+    """Validate every password in a file (one per line).
+
+    Passwords are streamed in blocks and, with workers > 1, validated in a
+    process pool. Returns (total, invalid, failures) where failures counts
+    how many passwords broke each rule.
+    """
+    total = 0
+    invalid = 0
+    failures = Counter()
+    blocks = read_password_blocks(password_file, block_size)
+    
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=init_audit_worker,
+                                  initargs=(blocklist_prefix,)) as pool:
+            for count, bad, block_failures in pool.imap_unordered(audit_block, blocks):
+                total += count
+                invalid += bad
+                failures.update(block_failures)
+    else:
+        init_audit_worker(blocklist_prefix)
+        for block in blocks:
+            count, bad, block_failures = audit_block(block)
+            total += count
+            invalid += bad
+            failures.update(block_failures)
+    
+    return total, invalid, failures
+
+def print_audit_report(total, invalid, failures, rules, elapsed):
+    print("=" * 50)
+    print("PASSWORD POLICY AUDIT")
+    print("=" * 50)
+    print(f"Passwords checked: {total}")
+    print(f"Failing policy: {invalid}")
+    print(f"Passing policy: {total - invalid}")
+    print("\nFailures per rule:")
+    for rule in rules:
+        pct = failures[rule] / total * 100 if total else 0
+        print(f"  {rule:<15} {failures[rule]:>12}  ({pct:.1f}%)")
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"\nThroughput: {rate:,.0f} passwords/sec ({elapsed:.2f}s)")
+    print("=" * 50)
+
+def interactive_check(blocklist=None):
     print("=" * 50)
     print("PASSWORD STRENGTH VALIDATOR")
     print("=" * 50)
@@ -40,7 +162,7 @@ def main():
     print()
     
     password = input("Enter password to validate: ")
-    results = validate_password(password)
+    results = validate_password(password, blocklist)
     
     print("\n" + "=" * 50)
     print("VALIDATION RESULTS")
@@ -61,6 +183,10 @@ def main():
     check_symbol = "✓" if results['has_special'] else "✗"
     print(f"{check_symbol} Contains special char: {results['has_special']}")
     
+    if 'not_breached' in results:
+        check_symbol = "✓" if results['not_breached'] else "✗"
+        print(f"{check_symbol} Not in breached list: {results['not_breached']}")
+    
     print("\n" + "=" * 50)
     if results['is_valid']:
         print("✓ PASSWORD IS STRONG!")
@@ -68,5 +194,32 @@ def main():
         print("✗ PASSWORD IS WEAK - Please address failed requirements")
     print("=" * 50)
 
+def main():
+    parser = argparse.ArgumentParser(description="Password strength validator")
+    parser.add_argument('--audit', metavar='FILE',
+                        help="validate every password in FILE (one per line)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for --audit (default: 1)")
+    parser.add_argument('--blocklist', metavar='PREFIX',
+                        help="reject passwords found in this blocklist index")
+    parser.add_argument('--build-blocklist', nargs=2, metavar=('SOURCE', 'PREFIX'),
+                        help="build a blocklist index from SOURCE")
+    args = parser.parse_args()
+    
+    if args.build_blocklist:
+        source, prefix = args.build_blocklist
+        count = build_blocklist(source, prefix)
+        print(f"Blocklist built: {count} distinct passwords -> {prefix}.*")
+    elif args.audit:
+        start = time.perf_counter()
+        total, invalid, failures = audit_passwords(
+            args.audit, args.workers, args.blocklist)
+        rules = RULES + (['not_breached'] if args.blocklist else [])
+        print_audit_report(total, invalid, failures, rules,
+                           time.perf_counter() - start)
+    else:
+        blocklist = Blocklist(args.blocklist) if args.blocklist else None
+        interactive_check(blocklist)
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,308 @@
+"""Columnar binary storage for pricing reports.
+
+A columnar report is a directory of flat files that can be memory-mapped
+directly:
+
+    base_price.f64    float64 per row
+    discount_pct.f64  float64 per row
+    final_price.f64   float64 per row
+    names.bin         UTF-8 product names, back to back
+    name_offsets.i64  int64 start offset of each name in names.bin (rows + 1)
+    name_index.i64    open-addressing hash table of row + 1 (0 = empty slot)
+    meta.json         row count and discount total
+
+Rows are stored in the same order as the text report.
+"""
+import hashlib
+import json
+import mmap
+import os
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PRICE_COLUMNS = ('base_price', 'discount_pct', 'final_price')
+MAX_INDEX_LOAD = 0.5
+
+def column_path(directory, column):
+    return os.path.join(directory, f"{column}.f64")
+
+def name_hash(name_bytes):
+    digest = hashlib.blake2b(name_bytes, digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+def write_float_column(f, values):
+    if np is not None and isinstance(values, np.ndarray):
+        values.astype(np.float64).tofile(f)
+    elif isinstance(values, array) and values.typecode == 'd':
+        values.tofile(f)
+    else:
+        array('d', values).tofile(f)
+
+def read_meta(directory):
+    with open(os.path.join(directory, 'meta.json'), 'r') as f:
+        return json.load(f)
+
+def write_meta(directory, rows, total_discount):
+    with open(os.path.join(directory, 'meta.json'), 'w') as f:
+        json.dump({'rows': rows, 'total_discount': total_discount}, f)
+
+def map_file(path, writable=False):
+    """Memory-map a whole file, returning None for an empty file."""
+    with open(path, 'r+b' if writable else 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        return mmap.mmap(f.fileno(), 0, access=access)
+
+def build_name_index(directory, rows):
+    """Write a fresh hash index over the first `rows` names."""
+    slots = 16
+    while slots * MAX_INDEX_LOAD < rows + 1:
+        slots *= 2
+
+    index_path = os.path.join(directory, 'name_index.i64')
+    with open(index_path, 'wb') as f:
+        f.truncate(slots * 8)
+
+    names = map_file(os.path.join(directory, 'names.bin'))
+    offsets = map_file(os.path.join(directory, 'name_offsets.i64'))
+    index = map_file(index_path, writable=True)
+    try:
+        offset_view = memoryview(offsets).cast('q')
+        index_view = memoryview(index).cast('q')
+        for row in range(rows):
+            name_bytes = names[offset_view[row]:offset_view[row + 1]] if names else b''
+            insert_name(index_view, name_bytes, row)
+        index_view.release()
+        offset_view.release()
+    finally:
+        index.close()
+        offsets.close()
+        if names is not None:
+            names.close()
+
+def insert_name(index_view, name_bytes, row):
+    mask = len(index_view) - 1
+    slot = name_hash(name_bytes) & mask
+    while index_view[slot]:
+        slot = (slot + 1) & mask
+    index_view[slot] = row + 1
+
+class ColumnarWriter:
+    """Writes priced blocks to a new columnar report directory."""
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = {column: open(column_path(directory, column), 'wb')
+                        for column in PRICE_COLUMNS}
+        self.name_file = open(os.path.join(directory, 'names.bin'), 'wb')
+        self.offset_file = open(os.path.join(directory, 'name_offsets.i64'), 'wb')
+        array('q', [0]).tofile(self.offset_file)
+        self.rows = 0
+        self.name_bytes = 0
+        self.total_discount = 0
+
+    def append(self, names, base_prices, discount_pct, final_price):
+        encoded = [name.encode('utf-8') for name in names]
+        offsets = array('q')
+        for name_bytes in encoded:
+            self.name_bytes += len(name_bytes)
+            offsets.append(self.name_bytes)
+
+        self.name_file.write(b''.join(encoded))
+        offsets.tofile(self.offset_file)
+        write_float_column(self.columns['base_price'], base_prices)
+        write_float_column(self.columns['discount_pct'], discount_pct)
+        write_float_column(self.columns['final_price'], final_price)
+
+        self.rows += len(encoded)
+        self.total_discount += float(sum(discount_pct))
+
+    def append_partial(self, directory):
+        """Append every row of another columnar directory (without its index)."""
+        meta = read_meta(directory)
+        for column in PRICE_COLUMNS:
+            with open(column_path(directory, column), 'rb') as f:
+                copy_stream(f, self.columns[column])
+
+        with open(os.path.join(directory, 'names.bin'), 'rb') as f:
+            copy_stream(f, self.name_file)
+
+        with open(os.path.join(directory, 'name_offsets.i64'), 'rb') as f:
+            f.seek(8)
+            base = self.name_bytes
+            while True:
+                offsets = array('q')
+                offsets.frombytes(f.read(8 * 65536))
+                if not offsets:
+                    break
+                array('q', (offset + base for offset in offsets)).tofile(self.offset_file)
+                self.name_bytes = offsets[-1] + base
+
+        self.rows += meta['rows']
+        self.total_discount += meta['total_discount']
+
+    def close(self, build_index=True):
+        for f in self.columns.values():
+            f.close()
+        self.name_file.close()
+        self.offset_file.close()
+        if build_index:
+            build_name_index(self.directory, self.rows)
+        write_meta(self.directory, self.rows, self.total_discount)
+
+def copy_stream(src, dst, chunk_size=1024 * 1024):
+    while True:
+        data = src.read(chunk_size)
+        if not data:
+            break
+        dst.write(data)
+
+class ColumnarReport:
+    """Memory-mapped view of a columnar report.
+
+    base_price, discount_pct and final_price are float64 memoryviews indexed
+    by row. With writable=True prices can be patched in place with update().
+    """
+
+    def __init__(self, directory, writable=False):
+        self.directory = directory
+        self.writable = writable
+        meta = read_meta(directory)
+        self.rows = meta['rows']
+        self.total_discount = meta['total_discount']
+        self.modified = False
+
+        self.maps = {}
+        self.views = {}
+        for column in PRICE_COLUMNS:
+            self.maps[column] = map_file(column_path(directory, column), writable)
+            self.views[column] = (memoryview(self.maps[column]).cast('d')
+                                  if self.maps[column] is not None else [])
+        self.names = map_file(os.path.join(directory, 'names.bin'))
+        self.offset_map = map_file(os.path.join(directory, 'name_offsets.i64'))
+        self.offsets = memoryview(self.offset_map).cast('q')
+        self.index_map = map_file(os.path.join(directory, 'name_index.i64'))
+        self.index = memoryview(self.index_map).cast('q')
+
+    @property
+    def base_price(self):
+        return self.views['base_price']
+
+    @property
+    def discount_pct(self):
+        return self.views['discount_pct']
+
+    @property
+    def final_price(self):
+        return self.views['final_price']
+
+    def __len__(self):
+        return self.rows
+
+    def name_bytes(self, row):
+        if self.names is None:
+            return b''
+        return self.names[self.offsets[row]:self.offsets[row + 1]]
+
+    def name(self, row):
+        return self.name_bytes(row).decode('utf-8')
+
+    def find_all(self, name):
+        """Yield the row of every product called `name`.
+
+        Catalogues may repeat a name; each row is inserted into the index
+        separately, so all of them lie on the same probe sequence.
+        """
+        name_bytes = name.encode('utf-8')
+        mask = len(self.index) - 1
+        slot = name_hash(name_bytes) & mask
+        while self.index[slot]:
+            row = self.index[slot] - 1
+            if self.name_bytes(row) == name_bytes:
+                yield row
+            slot = (slot + 1) & mask
+
+    def find(self, name):
+        """Return the row of the first product called `name`, or None."""
+        return next(self.find_all(name), None)
+
+    def update(self, row, base_price, discount_pct, final_price):
+        if not self.writable:
+            raise ValueError("Columnar report was opened read-only")
+        self.total_discount += discount_pct - self.views['discount_pct'][row]
+        self.views['base_price'][row] = base_price
+        self.views['discount_pct'][row] = discount_pct
+        self.views['final_price'][row] = final_price
+        self.modified = True
+
+    def close(self):
+        if self.modified:
+            for mapped in self.maps.values():
+                if mapped is not None:
+                    mapped.flush()
+            write_meta(self.directory, self.rows, self.total_discount)
+
+        for view in list(self.views.values()) + [self.offsets, self.index]:
+            if isinstance(view, memoryview):
+                view.release()
+        for mapped in list(self.maps.values()) + [self.names, self.offset_map,
+                                                  self.index_map]:
+            if mapped is not None:
+                mapped.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def append_rows(directory, names, base_prices, discount_pct, final_price):
+    """Append new rows to an existing columnar report and index their names.
+
+    The hash index is only rebuilt when it would become more than half full,
+    so appends cost time proportional to the number of new rows on average.
+    """
+    meta = read_meta(directory)
+    rows = meta['rows']
+
+    with open(os.path.join(directory, 'name_offsets.i64'), 'rb') as f:
+        f.seek(rows * 8)
+        name_end = array('q', f.read(8))[0]
+
+    encoded = [name.encode('utf-8') for name in names]
+    offsets = array('q')
+    for name_bytes in encoded:
+        name_end += len(name_bytes)
+        offsets.append(name_end)
+
+    with open(os.path.join(directory, 'names.bin'), 'ab') as f:
+        f.write(b''.join(encoded))
+    with open(os.path.join(directory, 'name_offsets.i64'), 'ab') as f:
+        offsets.tofile(f)
+    for column, values in zip(PRICE_COLUMNS,
+                              (base_prices, discount_pct, final_price)):
+        with open(column_path(directory, column), 'ab') as f:
+            write_float_column(f, values)
+
+    new_rows = rows + len(encoded)
+    index_path = os.path.join(directory, 'name_index.i64')
+    slots = os.path.getsize(index_path) // 8
+
+    if (new_rows + 1) > slots * MAX_INDEX_LOAD:
+        build_name_index(directory, new_rows)
+    else:
+        index = map_file(index_path, writable=True)
+        index_view = memoryview(index).cast('q')
+        for row, name_bytes in enumerate(encoded, rows):
+            insert_name(index_view, name_bytes, row)
+        index_view.release()
+        index.close()
+
+    write_meta(directory, new_rows,
+               meta['total_discount'] + float(sum(discount_pct)))
@@ -1,86 +1,444 @@
+import argparse
+import json
+import locale
 import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from array import array
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import metrics
+from pricing_columns import ColumnarReport, ColumnarWriter, append_rows
+
+DISCOUNT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               'pricing_discounts.json')
+
+DEFAULT_CATEGORY_DISCOUNTS = {
+    'Electronics': 10,
+    'Clothing': 15,
+    'Books': 5,
+    'Home': 12
+}
+
+DEFAULT_TIER_DISCOUNTS = {
+    'Premium': 5,
+    'Standard': 0,
+    'Budget': 2
+}
+
+_discount_tables = None
+
+def load_discount_tables(config_file=DISCOUNT_CONFIG):
+    """Read the category and tier discount tables from a JSON config file.
+
+    Falls back to the built-in tables if the file does not exist. Discounts
+    may be fractional percentages; anything that is not a number is
+    rejected with ValueError.
+    """
+    try:
+        with open(config_file, 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return dict(DEFAULT_CATEGORY_DISCOUNTS), dict(DEFAULT_TIER_DISCOUNTS)
+    
+    tables = config['category_discounts'], config['tier_discounts']
+    for table in tables:
+        for name, discount in table.items():
+            if isinstance(discount, bool) or not isinstance(discount, (int, float)):
+                raise ValueError(f"{config_file}: discount for {name!r} "
+                                 f"must be a number, not {discount!r}")
+    return tables
+
+def get_discount_tables():
+    global _discount_tables
+    if _discount_tables is None:
+        _discount_tables = load_discount_tables()
+    return _discount_tables
 
 def calculate_discount(category, tier):
-    category_discounts = {
-        'Electronics': 10,
-        'Clothing': 15,
-        'Books': 5,
-        'Home': 12
-    }
-    
-    tier_discounts = {
-        'Premium': 5,
-        'Standard': 0,
-        'Budget': 2
-    }
+    category_discounts, tier_discounts = get_discount_tables()
     
     category_discount = category_discounts.get(category, 0)
     tier_discount = tier_discounts.get(tier, 0)
     
     return category_discount + tier_discount
 
-def process_products(input_file, output_file):
+class PricingEngine:
+    """Prices whole blocks of products at once.
+
+    Categories and tiers are encoded as small integer codes (0 means unknown
+    and gets no discount), so the discount for a block is a table lookup on
+    the code arrays. NumPy is used when it is installed; otherwise the same
+    arithmetic runs over array.array columns.
+    """
+    
+    def __init__(self, category_discounts=None, tier_discounts=None):
+        default_categories, default_tiers = get_discount_tables()
+        if category_discounts is None:
+            category_discounts = default_categories
+        if tier_discounts is None:
+            tier_discounts = default_tiers
+        
+        self.category_codes = {name: code for code, name
+                               in enumerate(category_discounts, 1)}
+        self.tier_codes = {name: code for code, name
+                           in enumerate(tier_discounts, 1)}
+        # Float tables so fractional discounts survive on both paths.
+        self.category_table = [0.0] + [float(d) for d in category_discounts.values()]
+        self.tier_table = [0.0] + [float(d) for d in tier_discounts.values()]
+        
+        if np is not None:
+            self.category_table = np.array(self.category_table, dtype=np.float64)
+            self.tier_table = np.array(self.tier_table, dtype=np.float64)
+    
+    def encode(self, categories, tiers):
+        category_get = self.category_codes.get
+        tier_get = self.tier_codes.get
+        category_codes = array('H', [category_get(c, 0) for c in categories])
+        tier_codes = array('H', [tier_get(t, 0) for t in tiers])
+        return category_codes, tier_codes
+    
+    def price_block(self, base_prices, category_codes, tier_codes):
+        """Return (discount_pct, discount_amt, final_price) for a block.
+
+        The results are NumPy arrays when NumPy is available and lists
+        otherwise; in both cases the values match calculate_discount and
+        the per-row arithmetic exactly.
+        """
+        if np is not None:
+            base = np.asarray(base_prices, dtype=np.float64)
+            discount_pct = (self.category_table[np.asarray(category_codes)]
+                            + self.tier_table[np.asarray(tier_codes)])
+            discount_amt = base * (discount_pct / 100)
+            final_price = base - discount_amt
+            return discount_pct, discount_amt, final_price
+        
+        category_table = self.category_table
+        tier_table = self.tier_table
+        discount_pct = [category_table[c] + tier_table[t]
+                        for c, t in zip(category_codes, tier_codes)]
+        discount_amt = [price * (pct / 100)
+                        for price, pct in zip(base_prices, discount_pct)]
+        final_price = [price - amt
+                       for price, amt in zip(base_prices, discount_amt)]
+        return discount_pct, discount_amt, final_price
+
+_engine = None
+
+def get_pricing_engine():
+    global _engine
+    if _engine is None:
+        _engine = PricingEngine()
+    return _engine
+
+CHUNK_SIZE_HINT = 4 * 1024 * 1024
+
+def write_report_header(f):
+    f.write("=" * 90 + "\n")
+    f.write("PRICING REPORT\n")
+    f.write("=" * 90 + "\n")
+    f.write(f"{'Product Name':<30} {'Base Price':>12} {'Discount %':>12} "
+            f"{'Discount $':>12} {'Final Price':>12}\n")
+    f.write("-" * 90 + "\n")
+
+def write_report_footer(f):
+    f.write("=" * 90 + "\n")
+
+def report_issue(issues, level, line_num, message):
+    if issues is None:
+        logging.log(level, f"Line {line_num}: {message}")
+    else:
+        issues.append((level, line_num, message))
+
+def parse_chunk(lines, first_line_num, issues=None):
+    """Split a block of input lines into name/price/category/tier columns.
+
+    Malformed lines are skipped. They are logged with their line number
+    straight away, or, if an issues list is given, recorded in it as
+    (level, line_num, message) so the caller can log them later.
+    """
+    names = []
+    base_prices = array('d')
+    categories = []
+    tiers = []
+    
+    for line_num, line in enumerate(lines, first_line_num):
+        try:
+            parts = line.strip().split(',')
+            if len(parts) != 4:
+                report_issue(issues, logging.WARNING, line_num,
+                             "Invalid format, skipping")
+                continue
+            
+            name, price_str, category, tier = parts
+            base_prices.append(float(price_str))
+            names.append(name)
+            categories.append(category)
+            tiers.append(tier)
+            
+        except ValueError as e:
+            report_issue(issues, logging.ERROR, line_num,
+                         f"Invalid price format - {e}")
+            continue
+    
+    return names, base_prices, categories, tiers
+
+def format_rows(names, base_prices, discount_pct, discount_amt, final_price):
+    if np is not None:
+        discount_pct = discount_pct.tolist()
+        discount_amt = discount_amt.tolist()
+        final_price = final_price.tolist()
+    
+    return "".join(
+        f"{name:<30} "
+        f"${base_price:>11.2f} "
+        f"{pct:>11.1f}% "
+        f"${amt:>11.2f} "
+        f"${final:>11.2f}\n"
+        for name, base_price, pct, amt, final
+        in zip(names, base_prices, discount_pct, discount_amt, final_price)
+    )
+
+def price_chunk(lines, first_line_num, engine=None, issues=None, columns=None):
+    """Price a block of input lines and return the report rows for it.
+
+    If a ColumnarWriter is given the priced block is also appended to it.
+    Returns (rows_text, product_count, discount_total).
+    """
+    if engine is None:
+        engine = get_pricing_engine()
+    
+    with metrics.timer('pricing.parse'):
+        names, base_prices, categories, tiers = parse_chunk(lines, first_line_num,
+                                                            issues)
+    with metrics.timer('pricing.price'):
+        category_codes, tier_codes = engine.encode(categories, tiers)
+        discount_pct, discount_amt, final_price = engine.price_block(
+            base_prices, category_codes, tier_codes)
+    
+    with metrics.timer('pricing.render'):
+        if columns is not None:
+            columns.append(names, base_prices, discount_pct, final_price)
+        
+        rows_text = format_rows(names, base_prices, discount_pct,
+                                discount_amt, final_price)
+    metrics.count('pricing.lines', len(lines))
+    metrics.count('pricing.products', len(names))
+    return rows_text, len(names), float(sum(discount_pct))
+
+def price_file_serial(input_file, output_file, chunk_size=CHUNK_SIZE_HINT,
+                      columnar_dir=None):
+    """Price input_file in a single process.
+
+    Returns (product_count, total_discount, line_count).
+    """
+    product_count = 0
+    total_discount = 0
+    line_num = 1
+    columns = ColumnarWriter(columnar_dir) if columnar_dir else None
+    
+    with open(input_file, 'r') as f_in, open(output_file, 'w') as f_out:
+        write_report_header(f_out)
+        
+        while True:
+            lines = f_in.readlines(chunk_size)
+            if not lines:
+                break
+            
+            rows_text, count, discount_total = price_chunk(
+                lines, line_num, columns=columns)
+            f_out.write(rows_text)
+            
+            product_count += count
+            total_discount += discount_total
+            line_num += len(lines)
+        
+        write_report_footer(f_out)
+    
+    if columns is not None:
+        columns.close()
+    
+    return product_count, total_discount, line_num - 1
+
+def find_partitions(input_file, parts):
+    """Split input_file into up to `parts` byte ranges that start on a line."""
+    size = os.path.getsize(input_file)
+    boundaries = [0]
+    
+    with open(input_file, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(size * i // parts)
+            f.readline()
+            offset = f.tell()
+            if boundaries[-1] < offset < size:
+                boundaries.append(offset)
+    
+    boundaries.append(size)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def read_line_blocks(f, start, end, chunk_size):
+    """Yield lists of decoded lines from the byte range [start, end) of f.
+
+    Line endings are normalised the same way text-mode files do it, so
+    line counts match what the serial path sees.
+    """
+    encoding = locale.getpreferredencoding(False)
+    f.seek(start)
+    remaining = end - start
+    leftover = b''
+    
+    while remaining > 0:
+        data = f.read(min(chunk_size, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+        data = leftover + data
+        leftover = b''
+        
+        if remaining > 0:
+            cut = data.rfind(b'\n') + 1
+            data, leftover = data[:cut], data[cut:]
+        if not data:
+            continue
+        
+        text = data.decode(encoding)
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        lines = text.split('\n')
+        if lines[-1] == '':
+            lines.pop()
+        yield lines
+    
+    if leftover:
+        yield [leftover.decode(encoding)]
+
+def price_partition(task):
+    """Worker entry point: price one byte range into its own partial report.
+
+    Line numbers in the returned issues are relative to the start of the
+    partition; the parent shifts them once it knows the preceding line
+    counts.
+    """
+    input_file, start, end, partial_file, chunk_size, columnar_dir = task
+    product_count = 0
+    total_discount = 0
+    line_num = 1
+    issues = []
+    columns = ColumnarWriter(columnar_dir) if columnar_dir else None
+    
+    with open(input_file, 'rb') as f_in, open(partial_file, 'w') as f_out:
+        for lines in read_line_blocks(f_in, start, end, chunk_size):
+            rows_text, count, discount_total = price_chunk(
+                lines, line_num, issues=issues, columns=columns)
+            f_out.write(rows_text)
+            
+            product_count += count
+            total_discount += discount_total
+            line_num += len(lines)
+    
+    if columns is not None:
+        columns.close(build_index=False)
+    
+    return partial_file, product_count, total_discount, line_num - 1, issues
+
+def price_file_parallel(input_file, output_file, workers,
+                        chunk_size=CHUNK_SIZE_HINT, columnar_dir=None):
+    """Price input_file across worker processes.
+
+    Each worker prices one byte range into a partial report. The partials
+    are concatenated in file order, so the report is identical to the one
+    price_file_serial writes. Returns (product_count, total_discount,
+    line_count).
+    """
+    partitions = find_partitions(input_file, workers)
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    temp_dir = tempfile.mkdtemp(prefix='pricing_', dir=output_dir)
+    
     try:
-        products = []
+        tasks = [
+            (input_file, start, end,
+             os.path.join(temp_dir, f"part_{i:05d}.txt"), chunk_size,
+             os.path.join(temp_dir, f"part_{i:05d}_columns") if columnar_dir else None)
+            for i, (start, end) in enumerate(partitions)
+        ]
+        
+        # Worker processes keep their own (discarded) stage timings, so the
+        # parallel run is recorded as one stage here.
+        with metrics.timer('pricing.workers'), \
+                multiprocessing.Pool(min(workers, len(tasks))) as pool:
+            results = pool.map(price_partition, tasks)
+        metrics.count('pricing.lines', sum(result[3] for result in results))
+        metrics.count('pricing.products', sum(result[1] for result in results))
+        
+        product_count = 0
         total_discount = 0
+        line_offset = 0
+        columns = ColumnarWriter(columnar_dir) if columnar_dir else None
         
-        with open(input_file, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                try:
-                    parts = line.strip().split(',')
-                    if len(parts) != 4:
-                        logging.warning(f"Line {line_num}: Invalid format, skipping")
-                        continue
-                    
-                    name, price_str, category, tier = parts
-                    base_price = float(price_str)
-                    discount_pct = calculate_discount(category, tier)
-                    discount_amt = base_price * (discount_pct / 100)
-                    final_price = base_price - discount_amt
-                    
-                    products.append({
-                        'name': name,
-                        'base_price': base_price,
-                        'discount_pct': discount_pct,
-                        'discount_amt': discount_amt,
-                        'final_price': final_price
-                    })
-                    
-                    total_discount += discount_pct
-                    
-                except ValueError as e:
-                    logging.error(f"Line {line_num}: Invalid price format - {e}")
-                    continue
-        
-        with open(output_file, 'w') as f:
-            f.write("=" * 90 + "\n")
-            f.write("PRICING REPORT\n")
-            f.write("=" * 90 + "\n")
-            f.write(f"{'Product Name':<30} {'Base Price':>12} {'Discount %':>12} "
-                    f"{'Discount $':>12} {'Final Price':>12}\n")
-            f.write("-" * 90 + "\n")
+        with open(output_file, 'w') as f_out:
+            write_report_header(f_out)
             
-            for product in products:
-                f.write(f"{product['name']:<30} "
-                        f"${product['base_price']:>11.2f} "
-                        f"{product['discount_pct']:>11.1f}% "
-                        f"${product['discount_amt']:>11.2f} "
-                        f"${product['final_price']:>11.2f}\n")
+            for partial_file, count, discount_total, line_count, issues in results:
+                for level, line_num, message in issues:
+                    logging.log(level, f"Line {line_offset + line_num}: {message}")
+                
+                with open(partial_file, 'r') as f_part:
+                    shutil.copyfileobj(f_part, f_out)
+                
+                product_count += count
+                total_discount += discount_total
+                line_offset += line_count
             
-            f.write("=" * 90 + "\n")
+            write_report_footer(f_out)
+        
+        if columns is not None:
+            for task in tasks:
+                columns.append_partial(task[-1])
+            columns.close()
         
-        avg_discount = total_discount / len(products) if products else 0
+        return product_count, total_discount, line_offset
+    
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def process_products(input_file, output_file, chunk_size=CHUNK_SIZE_HINT,
+                     workers=1, columnar_dir=None):
+    """Price every product in input_file and write the report to output_file.
+
+    The input is read in blocks of roughly chunk_size bytes and each block is
+    written to the report as soon as it is priced, so memory use does not
+    grow with the size of the catalogue. With workers > 1 the file is split
+    into byte ranges that are priced in parallel. If columnar_dir is given
+    the prices are also written there in columnar binary form.
+    """
+    try:
+        start_time = time.perf_counter()
+        
+        if workers > 1:
+            product_count, total_discount, line_count = price_file_parallel(
+                input_file, output_file, workers, chunk_size, columnar_dir)
+        else:
+            product_count, total_discount, line_count = price_file_serial(
+                input_file, output_file, chunk_size, columnar_dir)
+        
+        elapsed = time.perf_counter() - start_time
+        rows_per_sec = line_count / elapsed if elapsed > 0 else 0
+        
+        avg_discount = total_discount / product_count if product_count else 0
         print("\nProcessing Complete!")
-        print(f"Total products processed: {len(products)}")
+        print(f"Total products processed: {product_count}")
         print(f"Average discount applied: {avg_discount:.2f}%")
+        print(f"Throughput: {rows_per_sec:,.0f} rows/sec ({elapsed:.2f}s)")
         print(f"Report saved to: {output_file}")
         
-        logging.info(f"Successfully processed {len(products)} products")
+        logging.info(f"Successfully processed {product_count} products")
         
     except FileNotFoundError:
         logging.error(f"Input file '{input_file}' not found")
@@ -92,5 +450,115 @@ def process_products(input_file, output_file):
         logging.error(f"Unexpected error: {e}")
         print(f"Error: {e}")
 
+def reprice_changes(columnar_dir, changes_file, chunk_size=CHUNK_SIZE_HINT):
+    """Re-price only the products listed in changes_file.
+
+    changes_file uses the same format as the product catalogue. Products
+    already in the columnar report at columnar_dir are updated in place,
+    every row of a name that appears more than once in the catalogue;
+    unknown names are appended as new rows. Returns (updated rows, added).
+    """
+    engine = get_pricing_engine()
+    updated = 0
+    new_names = []
+    new_prices = {}
+    line_num = 1
+    
+    with ColumnarReport(columnar_dir, writable=True) as report, \
+            open(changes_file, 'r') as f:
+        while True:
+            lines = f.readlines(chunk_size)
+            if not lines:
+                break
+            
+            names, base_prices, categories, tiers = parse_chunk(lines, line_num)
+            category_codes, tier_codes = engine.encode(categories, tiers)
+            discount_pct, discount_amt, final_price = engine.price_block(
+                base_prices, category_codes, tier_codes)
+            
+            for i, name in enumerate(names):
+                prices = (base_prices[i], float(discount_pct[i]),
+                          float(final_price[i]))
+                found = False
+                for row in report.find_all(name):
+                    report.update(row, *prices)
+                    updated += 1
+                    found = True
+                if not found:
+                    if name not in new_prices:
+                        new_names.append(name)
+                    new_prices[name] = prices
+            
+            line_num += len(lines)
+    
+    if new_names:
+        columns = [new_prices[name] for name in new_names]
+        append_rows(columnar_dir, new_names,
+                    [c[0] for c in columns],
+                    [c[1] for c in columns],
+                    [c[2] for c in columns])
+    
+    logging.info(f"Re-priced {updated} products, added {len(new_names)}")
+    return updated, len(new_names)
+
+def render_report(columnar_dir, output_file):
+    """Write the fixed-width text report for a columnar report."""
+    with ColumnarReport(columnar_dir) as report, open(output_file, 'w') as f:
+        write_report_header(f)
+        block_size = 65536
+        for start in range(0, len(report), block_size):
+            rows = range(start, min(start + block_size, len(report)))
+            base_prices = [report.base_price[row] for row in rows]
+            discount_pct = [report.discount_pct[row] for row in rows]
+            discount_amt = [price * (pct / 100)
+                            for price, pct in zip(base_prices, discount_pct)]
+            f.write("".join(
+                f"{report.name(row):<30} "
+                f"${base_price:>11.2f} "
+                f"{pct:>11.1f}% "
+                f"${amt:>11.2f} "
+                f"${report.final_price[row]:>11.2f}\n"
+                for row, base_price, pct, amt
+                in zip(rows, base_prices, discount_pct, discount_amt)
+            ))
+        write_report_footer(f)
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    
+    parser = argparse.ArgumentParser(description="Generate a pricing report")
+    parser.add_argument('input_file', nargs='?', default='products.txt')
+    parser.add_argument('output_file', nargs='?', default='pricing_report.txt')
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes to use (default: 1)")
+    parser.add_argument('--columnar', metavar='DIR',
+                        help="also write a columnar binary report to DIR")
+    parser.add_argument('--changes', metavar='FILE',
+                        help="re-price only the products in FILE, updating "
+                             "the columnar report given with --columnar, then "
+                             "regenerate output_file from it")
+    args = parser.parse_args()
+    
+    if args.changes:
+        if not args.columnar:
+            parser.error("--changes requires --columnar")
+        try:
+            updated, added = reprice_changes(args.columnar, args.changes)
+        except FileNotFoundError as e:
+            logging.error(f"File '{e.filename}' not found")
+            print(f"Error: Could not find {e.filename}")
+            return
+        print(f"Updated {updated} products, added {added} new products "
+              f"in {args.columnar}")
+        render_report(args.columnar, args.output_file)
+        print(f"Report regenerated in {args.output_file}")
+        return
+    
+    process_products(args.input_file, args.output_file, workers=args.workers,
+                     columnar_dir=args.columnar)
+
 if __name__ == "__main__":
-    process_products('products.txt', 'pricing_report.txt')
+    main()
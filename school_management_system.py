@@ -1,4 +1,11 @@
+import argparse
+import csv
+import sys
+import time
+
 class Person:
+    __slots__ = ('name', 'age')
+    
     def __init__(self, name, age):
         self.name = name
         self.age = age
@@ -7,6 +14,8 @@ class Person:
         return f"Hi, I'm {self.name} and I'm {self.age} years old."
 
 class Student(Person):
+    __slots__ = ('student_id',)
+    
     def __init__(self, name, age, student_id):
         super().__init__(name, age)
         self.student_id = student_id
@@ -15,6 +24,8 @@ class Student(Person):
         return f"Hi, I'm {self.name}, a student. My ID is {self.student_id} and I'm {self.age} years old."
 
 class Teacher(Person):
+    __slots__ = ('subject',)
+    
     def __init__(self, name, age, subject):
         super().__init__(name, age)
         self.subject = subject
@@ -22,11 +33,142 @@ class Teacher(Person):
     def introduce(self):
         return f"Hello, I'm {self.name}, a teacher. I teach {self.subject} and I'm {self.age} years old."
 
-student = Student("Alice", 16, "S001")
-teacher = Teacher("Mr. Smith", 35, "Mathematics")
+class Roster:
+    """District roster with hash indexes on student ID and teacher subject.
+    
+    Lookups by student_id and by subject are dictionary lookups rather than
+    scans. Subject names are interned, so every teacher of a subject shares
+    one string.
+    """
+    
+    def __init__(self):
+        self.people = []
+        self.students_by_id = {}
+        self.teachers_by_subject = {}
+    
+    def __len__(self):
+        return len(self.people)
+    
+    def add(self, person):
+        if isinstance(person, Student):
+            if person.student_id in self.students_by_id:
+                raise ValueError(f"Duplicate student ID: {person.student_id}")
+            self.students_by_id[person.student_id] = person
+        elif isinstance(person, Teacher):
+            person.subject = sys.intern(person.subject)
+            self.teachers_by_subject.setdefault(person.subject, []).append(person)
+        self.people.append(person)
+        return person
+    
+    def find_student(self, student_id):
+        return self.students_by_id.get(student_id)
+    
+    def teachers_for(self, subject):
+        return self.teachers_by_subject.get(subject, [])
+    
+    def subjects(self):
+        return sorted(self.teachers_by_subject)
+    
+    def load_csv(self, csv_file):
+        """Bulk-load people from a CSV file with a header row.
+    
+        Columns are role (student, teacher or anything else for a plain
+        person), name, age, and student_id or subject as the role needs.
+        Rows are read as plain lists and each becomes exactly one record
+        object. Rows with a bad age, a missing ID or subject, or a duplicate
+        student ID are skipped. Returns (loaded, skipped).
+        """
+        loaded = 0
+        skipped = 0
+        students_by_id = self.students_by_id
+        teachers_by_subject = self.teachers_by_subject
+        append = self.people.append
+        intern = sys.intern
+    
+        with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = [column.strip().lower() for column in next(reader, [])]
+            try:
+                role_i = header.index('role')
+                name_i = header.index('name')
+                age_i = header.index('age')
+            except ValueError:
+                raise ValueError("CSV header must contain role, name and age columns")
+            id_i = header.index('student_id') if 'student_id' in header else None
+            subject_i = header.index('subject') if 'subject' in header else None
+    
+            for row in reader:
+                try:
+                    role = row[role_i].strip().lower()
+                    name = row[name_i]
+                    age = int(row[age_i])
+                    if role == 'student':
+                        student_id = row[id_i].strip()
+                        if not student_id or student_id in students_by_id:
+                            raise ValueError(student_id)
+                        person = students_by_id[student_id] = Student(name, age, student_id)
+                    elif role == 'teacher':
+                        subject = intern(row[subject_i].strip())
+                        if not subject:
+                            raise ValueError(subject)
+                        person = Teacher(name, age, subject)
+                        teachers = teachers_by_subject.get(subject)
+                        if teachers is None:
+                            teachers_by_subject[subject] = [person]
+                        else:
+                            teachers.append(person)
+                    else:
+                        person = Person(name, age)
+                except (IndexError, TypeError, ValueError):
+                    skipped += bool(row)
+                    continue
+    
+                append(person)
+                loaded += 1
+    
+        return loaded, skipped
+    
+    def iter_introductions(self, people=None):
+        """Yield introduce() for each person (the whole roster by default),
+        building each string only when it is asked for."""
+        for person in self.people if people is None else people:
+            yield person.introduce()
+
+def main():
+    parser = argparse.ArgumentParser(description="School management system")
+    parser.add_argument('--roster', metavar='FILE',
+                        help="load a role,name,age,student_id,subject CSV roster")
+    parser.add_argument('--student', metavar='ID', help="look up a student by ID")
+    parser.add_argument('--subject', help="list the teachers of a subject")
+    args = parser.parse_args()
+    
+    if args.roster:
+        roster = Roster()
+        start = time.perf_counter()
+        loaded, skipped = roster.load_csv(args.roster)
+        elapsed = time.perf_counter() - start
+        print(f"Loaded {loaded:,} people ({skipped:,} rows skipped) in {elapsed:.2f}s")
+        print(f"Students: {len(roster.students_by_id):,}, "
+              f"subjects taught: {len(roster.teachers_by_subject):,}")
+    
+        if args.student:
+            student = roster.find_student(args.student)
+            print(student.introduce() if student else f"No student with ID {args.student}")
+        if args.subject:
+            teachers = roster.teachers_for(args.subject)
+            print(f"\n{len(teachers):,} teachers of {args.subject}")
+            for introduction in roster.iter_introductions(teachers[:10]):
+                print(introduction)
+        return
+    
+    student = Student("Alice", 16, "S001")
+    teacher = Teacher("Mr. Smith", 35, "Mathematics")
+    
+    print("=== School Management System ===")
+    print(student.introduce())
+    print(teacher.introduce())
+    print(f"\nStudent age: {student.age}")
+    print(f"Teacher subject: {teacher.subject}")
 
-print("=== School Management System ===")
-print(student.introduce())
-print(teacher.introduce())
-print(f"\nStudent age: {student.age}")
-print(f"Teacher subject: {teacher.subject}")
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
-import requests
 import json
 import time
 from datetime import datetime
 
+import metrics
+
 eu_capitals = [
     {"city": "Vienna", "country": "Austria", "lat": 48.2082, "lon": 16.3738},
     {"city": "Brussels", "country": "Belgium", "lat": 50.8503, "lon": 4.3517},
@@ -49,6 +50,10 @@ def get_weather_code_description(code):
     return weather_codes.get(code, "Unknown")
 
 def fetch_weather_data(city_data):
+    # Imported here so importing this module (or the CLI) does not pay for
+    # loading requests unless weather data is actually fetched.
+    import requests
+    
     try:
         base_url = "https://api.open-meteo.com/v1/forecast"
         params = {
@@ -122,12 +127,15 @@ def collect_all_weather_data():
         city_name = capital["city"]
         print(f"[{i}/{total}] Fetching data for {city_name}, {capital['country']}...", end=" ")
         
-        city_weather = fetch_weather_data(capital)
+        with metrics.timer('weather.fetch'):
+            city_weather = fetch_weather_data(capital)
         
         if city_weather:
             weather_data[city_name] = city_weather
+            metrics.count('weather.fetched')
             print("Success")
         else:
+            metrics.count('weather.failed')
             print("Failed")
         
         if i < total:
@@ -138,7 +146,8 @@ def collect_all_weather_data():
 
 def save_to_json(data, filename="eu_weather_data.json"):
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
+        with metrics.timer('weather.render'), \
+                open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
         print(f"Data saved to {filename}")
         print(f"File size: {len(json.dumps(data)) / 1024:.2f} KB")